@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:21:48 2026
+"""
+import asyncio
+import concurrent.futures
+import logging as log
+import threading
+
+
+class AsyncEvaluator:
+
+    def __init__(self, concurrency=8, timeout=None, retries=0, failure_fitness=10**8):
+        """
+        Evaluation backend for Evolution, which calculates the fitness of
+        all given individuals concurrently with asyncio.
+
+        This is useful if f mostly waits on I/O, e.g. for an external
+        simulator service or a subprocess. f can be an async function
+        (or an object with an async __call__), otherwise it is called in
+        a thread, s.t. blocking calls don't block the other evaluations.
+        
+        A blocking f can't be interrupted: If it times out, evaluate returns
+        without waiting for it, but its thread keeps running in the background
+        until f returns (the interpreter waits for it on exit), and its result
+        is discarded. Only async objectives are actually cancelled.
+
+        Parameters
+        ----------
+        concurrency : int, optional
+            Maximal number of evaluations running at the same time.
+            The default is 8.
+        timeout : float, optional
+            Seconds after which a single evaluation is cancelled.
+            The default is None, which means no timeout.
+        retries : int, optional
+            Number of times an evaluation is repeated, which timed out
+            or failed with an OSError (e.g. a lost connection).
+            The default is 0.
+        failure_fitness : float, optional
+            Fitness value of an individual whose evaluation failed after
+            all retries, or raised any other exception. Those exceptions
+            are logged, since they usually are errors in f.
+            The default is 10**8, the value f uses outside of the constraint.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.failure_fitness = failure_fitness
+
+        # statistics about the evaluations
+        self.n_retries = 0
+        self.n_failed = 0
+        self.n_errors = 0
+
+    def evaluate(self, instances, f):
+        """
+        Calculate the fitness of all instances and wait until all are finished.
+
+        Parameters
+        ----------
+        instances : list
+            Individuals whose fitness will be calculated.
+        f : function
+            Function that will be optimized.
+
+        Returns
+        -------
+        None.
+
+        """
+        coroutine = self.evaluateAsync(instances, f)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(coroutine)
+            return
+
+        # an event loop is already running (e.g. in a jupyter notebook),
+        # so the evaluations are processed by a new loop in another thread
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            executor.submit(asyncio.run, coroutine).result()
+
+    async def evaluateAsync(self, instances, f):
+        """
+        Coroutine that calculates the fitness of all instances,
+        with at most self.concurrency evaluations at the same time.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        # a dedicated executor for blocking calls of f, which isn't waited for on shutdown.
+        # Timed out calls keep their thread, so there are enough threads left for the retries
+        executor = concurrent.futures.ThreadPoolExecutor(self.concurrency*(self.retries + 1))
+        try:
+            await asyncio.gather(*[self.evaluateInstance(instance, f, semaphore, executor) for instance in instances])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def evaluateInstance(self, instance, f, semaphore, executor=None):
+        """
+        Calculate the fitness of a single instance, with timeout and retries.
+        """
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    await asyncio.wait_for(instance.fitnessFunctionAsync(f, executor), self.timeout)
+                    return
+                except (asyncio.TimeoutError, OSError):
+                    if attempt < self.retries:
+                        self.n_retries += 1
+                except Exception:
+                    log.exception(f"Evaluation of f({instance.x}, {instance.y}) failed")
+                    self.n_errors += 1
+                    break
+
+            self.n_failed += 1
+            instance.fitness_value = self.failure_fitness
+
+
+class RemoteObjective:
+
+    def __init__(self, host, port):
+        """
+        Async objective, which requests f(x,y) from a service speaking the
+        line protocol of StubSimulatorServer:
+            request  -> "<x> <y>\\n"
+            response -> "<f(x,y)>\\n"
+
+        Parameters
+        ----------
+        host : str
+            Host of the service.
+        port : int
+            Port of the service.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.host = host
+        self.port = port
+
+    async def __call__(self, x, y):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f"{x!r} {y!r}\n".encode())
+            await writer.drain()
+            response = await reader.readline()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+        return float(response)
+
+
+class StubSimulatorServer:
+
+    def __init__(self, f, host="127.0.0.1", port=0, delay=0.0):
+        """
+        Local stand-in for an external simulator service, which can be used
+        to test the asynchronous evaluation. It evaluates f on every request
+        after waiting delay seconds. The server runs its own event loop
+        in a background thread.
+
+        Usage:
+            with StubSimulatorServer(f, delay=0.05) as server:
+                evol = Evolution(RemoteObjective(server.host, server.port), 100,
+                                 evaluator=AsyncEvaluator(concurrency=32))
+
+        Parameters
+        ----------
+        f : function
+            Function that will be served.
+        host : str, optional
+            Host the server binds to. The default is "127.0.0.1".
+        port : int, optional
+            Port the server binds to. The default is 0, which chooses a free port.
+        delay : float, optional
+            Simulated latency of every request in seconds. The default is 0.0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.f = f
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.n_requests = 0
+
+        self.loop = None
+        self.thread = None
+
+    async def handle(self, reader, writer):
+        request = await reader.readline()
+        x, y = map(float, request.split())
+        await asyncio.sleep(self.delay)
+
+        self.n_requests += 1
+        writer.write(f"{self.f(x, y)!r}\n".encode())
+        await writer.drain()
+        writer.close()
+
+    def start(self):
+        """
+        Start the server and wait until it accepts connections.
+        """
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        async def serve():
+            self.server = await asyncio.start_server(self.handle, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+            started.set()
+
+        def run():
+            self.loop.run_until_complete(serve())
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        started.wait()
+
+    def stop(self):
+        """
+        Stop the server and its event loop.
+        """
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
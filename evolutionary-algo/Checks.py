@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 10:12:40 2026
+
+Checks of the asynchronous evaluation, which fail with an AssertionError:
+    python Checks.py
+"""
+import time
+from AsyncEvaluation import AsyncEvaluator, RemoteObjective, StubSimulatorServer
+from Evolution import Evolution
+from Population import PopulationInstance, f
+
+
+def checkRemoteEvolution():
+    """
+    Run a few iterations of Evolution with a RemoteObjective against the
+    StubSimulatorServer and check that every individual got the fitness f(x,y)
+    from exactly one request.
+
+    Returns
+    -------
+    dict
+        Requests of the server and evaluations of the evolution.
+
+    """
+    with StubSimulatorServer(f, delay=0.01) as server:
+        evaluator = AsyncEvaluator(concurrency=16, timeout=5)
+        evol = Evolution(RemoteObjective(server.host, server.port), 40, evaluator=evaluator)
+        evol.initiatePopulation()
+        for _ in range(3):
+            evol.proceeOneIter(10, "top_n", "random", "random_uniform", 2)
+
+    assert server.n_requests == evol.n_evaluations, (server.n_requests, evol.n_evaluations)
+    assert evaluator.n_retries == evaluator.n_failed == evaluator.n_errors == 0
+    assert all(instance.fitness_value == f(instance.x, instance.y) for instance in evol.population_alive)
+    return dict(requests=server.n_requests, evaluations=evol.n_evaluations)
+
+
+def checkTimeoutsAndErrors():
+    """
+    Evaluate a blocking f, which hangs for x == 1, fails with an OSError on the
+    first call for x == 2 and raises a ValueError for x == 3, and check the
+    retries, failures and errors of the AsyncEvaluator. The timed out calls
+    can't be interrupted, but mustn't delay the evaluation. The traceback
+    of the ValueError is logged as expected.
+
+    Returns
+    -------
+    dict
+        Counters of the evaluator and the wall time of the evaluation.
+
+    """
+    calls = {2: 0}
+
+    def blocking_f(x, y):
+        if x == 1:
+            time.sleep(1)
+        if x == 2:
+            calls[2] += 1
+            if calls[2] == 1:
+                raise OSError("connection lost")
+        if x == 3:
+            raise ValueError("bug in f")
+        return x + y
+
+    instances = [PopulationInstance(x, 0, None, None, None, None) for x in (0, 1, 2, 3)]
+    evaluator = AsyncEvaluator(concurrency=4, timeout=0.1, retries=2, failure_fitness=10**8)
+
+    start = time.perf_counter()
+    evaluator.evaluate(instances, blocking_f)
+    wall_time = time.perf_counter() - start
+
+    # x == 1 times out 3 times (2 retries), x == 2 is retried once, x == 3 isn't retried
+    assert evaluator.n_retries == 3, evaluator.n_retries
+    assert evaluator.n_failed == 2, evaluator.n_failed
+    assert evaluator.n_errors == 1, evaluator.n_errors
+    assert [instance.fitness_value for instance in instances] == [0, 10**8, 2, 10**8]
+    assert wall_time < 0.8, wall_time
+    return dict(retries=evaluator.n_retries, failed=evaluator.n_failed, errors=evaluator.n_errors,
+                wall_time=round(wall_time, 3))
+
+
+if __name__ == "__main__":
+    print(f"remote evolution: {checkRemoteEvolution()}")
+    print(f"timeouts and errors: {checkTimeoutsAndErrors()}")
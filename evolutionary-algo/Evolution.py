@@ -4,16 +4,20 @@ Created on Thu May 27 21:10:51 2021
 
 @author: Bjarne Gerdes
 """
+import heapq
+import itertools
 import random
 import numpy as np
 import pandas as pd
 from Population import PopulationInstance
+from SpatialIndex import SpatialHash
 
 
 class Evolution:
     
     
-    def __init__(self, f, N_population):
+    def __init__(self, f, N_population, surrogate=None, surrogate_factor=3, unscreened_share=0.25,
+                 niche_radius=None, duplicate_epsilon=None, evaluator=None):
         """
         Initialize the evolutionary Algorithm
 
@@ -26,6 +30,41 @@ class Evolution:
             Describe the size of the population.
             S.t. every iteration ensure 100 that N_population many
             instances will be alive.
+        surrogate : class, optional
+            Cheap model of f like Surrogate.QuadraticSurrogate. If given,
+            surrogate_factor times more children than needed will be created
+            and only the ones with the best predicted fitness will be
+            evaluated by f. The model will be refit with every evaluated point.
+            The surrogate doesn't reduce the number of calls of f per iteration,
+            but lets the algorithm reach a target fitness with fewer calls
+            (see Variants.ProcessAllVariants.evaluationsToTarget). The stats
+            report the error of the model and the number of candidates it
+            screened out, i.e. that would have been evaluated without it.
+            Default None.
+        surrogate_factor : int, optional
+            Number of candidate children created per needed child, when
+            a surrogate is used. Default 3.
+        unscreened_share : float, optional
+            Probability that a child is created without screening, when a
+            surrogate is used. These children keep exploring regions the
+            surrogate rates badly, and correct the model there. Default 0.25.
+        niche_radius : float, optional
+            If given, fitness sharing is used in self.selectPopulation: The fitness
+            of each individual is multiplied with its niche count
+                
+                Σ (1 - distance/niche_radius) 
+                
+            over all individuals within niche_radius (including itself).
+            This penalizes crowded regions and keeps the population diverse.
+            Assumes non negative fitness values. Default None.
+        duplicate_epsilon : float, optional
+            If given, children that lie within duplicate_epsilon of an existing
+            individual will be rejected before their fitness is calculated.
+            Default None.
+        evaluator : class, optional
+            Backend which calculates the fitness of all children of an iteration
+            (or of a steady-state step) at once, like AsyncEvaluation.AsyncEvaluator.
+            Default None, which calls f for one individual after another.
 
         Returns
         -------
@@ -34,10 +73,37 @@ class Evolution:
         """
         self.f = f
         self.N_population = N_population
+        self.surrogate = surrogate
+        self.surrogate_factor = surrogate_factor
+        self.unscreened_share = unscreened_share
+        self.niche_radius = niche_radius
+        self.duplicate_epsilon = duplicate_epsilon
+        self.evaluator = evaluator
         
         self.population_alive = []
         self.population_history = []
         
+        # track the number of calls of f and the error of the surrogate
+        self.n_evaluations = 0
+        self.surrogate_errors = []
+        self.n_duplicates_rejected = 0
+        
+        # candidates that were created but not evaluated, since the surrogate rated them worse
+        self.n_candidates_screened = 0
+        
+        # spatial index of the living population, used to reject duplicates
+        self.duplicate_index = None
+        
+        # mutation parameters shared by the population (see self.adaptMutation)
+        self.mutation_std = 0.1
+        self.mutation_cov = np.eye(2)
+        self.covariance_learning_rate = 0.2
+        self.self_adaptive_learning_rate = 0.3
+        
+        # successful children and steps of the current adaptation window of the steady-state mode
+        self.window_successful = []
+        self.window_steps = 0
+        
         
     def initiatePopulation(self, population_start_x=None, population_start_y=None):
         """
@@ -68,10 +134,44 @@ class Evolution:
             
             instance = PopulationInstance(x, y, None, None, None, None)
 
-                    
-            # calculate fitness of this instance and append instance to population
-            instance.fitnessFunction(self.f)
             self.population_alive.append(instance)
+        
+        # calculate fitness of all instances of the population
+        self.evaluateInstances(self.population_alive)
+            
+    
+    def evaluateInstances(self, instances):
+        """
+        Calculate the fitness of the given instances and feed the
+        results to the surrogate, if one is used.
+
+        Parameters
+        ----------
+        instances : list
+            Individuals whose fitness will be calculated.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.evaluator is not None:
+            self.evaluator.evaluate(instances, self.f)
+        else:
+            for instance in instances:
+                instance.fitnessFunction(self.f)
+            
+        for instance in instances:
+            # store the error of the surrogate for the statistics, ignore inf values
+            if instance.predicted_fitness is not None and instance.fitness_value < 10**8:
+                self.surrogate_errors.append(abs(instance.predicted_fitness - instance.fitness_value))
+                
+        self.n_evaluations += len(instances)
+        
+        if self.surrogate is not None:
+            self.surrogate.update([instance.x for instance in instances],
+                                  [instance.y for instance in instances],
+                                  [instance.fitness_value for instance in instances])
             
     
     def selectPopulation(self, n_population_after, select_type, threshold_var):
@@ -115,9 +215,13 @@ class Evolution:
         None.
 
         """
-        # read fitness values of each instance 
-        instances_fitness_values = pd.DataFrame(([(instance, instance.fitness_value)\
-                                                      for instance in self.population_alive]))
+        # read fitness values of each instance, which are shared between neighbours if niching is used
+        if self.niche_radius is not None:
+            fitness_values = self.sharedFitness()
+        else:
+            fitness_values = [instance.fitness_value for instance in self.population_alive]
+            
+        instances_fitness_values = pd.DataFrame(list(zip(self.population_alive, fitness_values)))
  
         if select_type == "threshold":
             # select all that are below \mu + \sigma*threshold_var
@@ -129,12 +233,65 @@ class Evolution:
             # calculate rank of fitness and select top n
             instances_fitness_values["is_alive"] = instances_fitness_values[1].rank(method="first") <= n_population_after
         
-        # eliminate all dead instances:
-        for row in instances_fitness_values.values:
-            if row[2] == False:
-                self.population_alive.remove(row[0])
-                self.population_history.append(row[0])
+        # eliminate all dead instances, the rows have the same order as the population
+        # so the population can be rebuilt in one pass instead of removing each instance
+        is_alive = instances_fitness_values["is_alive"].values
+        for instance, alive in zip(self.population_alive, is_alive):
+            if not alive:
+                instance.is_alive = False
+                self.population_history.append(instance)
+                
+        self.population_alive = [instance for instance, alive in zip(self.population_alive, is_alive) if alive]
+                                
+    def sharedFitness(self):
+        """
+        Calculate the shared fitness of the living individuals,
+        see niche_radius in the documentation of self.__init__.
+        The neighbours are found by a spatial hash with the cell size niche_radius.
+
+        Returns
+        -------
+        list
+            Shared fitness values in the order of self.population_alive.
+
+        """
+        niche_index = SpatialHash(self.niche_radius, self.population_alive)
+        
+        shared_fitness_values = []
+        for instance in self.population_alive:
+            niche_count = sum(1 - distance/self.niche_radius\
+                              for _, distance in niche_index.neighbours(instance.x, instance.y, self.niche_radius))
+            shared_fitness_values.append(instance.fitness_value * niche_count)
+            
+        return shared_fitness_values
                                 
+    def rejectDuplicates(self, children):
+        """
+        Remove all children that lie within duplicate_epsilon of a living individual
+        or of another accepted child. The accepted children are added to 
+        self.duplicate_index.
+
+        Parameters
+        ----------
+        children : list
+            Individuals whose fitness hasn't been calculated yet.
+
+        Returns
+        -------
+        accepted : list
+            Children that aren't duplicates.
+
+        """
+        accepted = []
+        for child_instance in children:
+            if self.duplicate_index.hasNeighbour(child_instance.x, child_instance.y, self.duplicate_epsilon):
+                self.n_duplicates_rejected += 1
+            else:
+                self.duplicate_index.insert(child_instance)
+                accepted.append(child_instance)
+                
+        return accepted
+    
     def selectCrossoverPairs(self, pairing_type):
         """
         This function is used to select which pairs of instances
@@ -170,7 +327,8 @@ class Evolution:
         if pairing_type == "error_based":
             # calculate distribution of fitness values
             error_distribution = [instance.fitness_value for instance in self.population_alive]
-            error_distribution = [fitness_value/sum(error_distribution) for fitness_value in error_distribution]
+            error_sum = sum(error_distribution)
+            error_distribution = [fitness_value/error_sum for fitness_value in error_distribution]
             
         # parameter that avoids getting stuck in the while loop when the number of combinations
         # isn't sufficient.
@@ -188,13 +346,7 @@ class Evolution:
                 
             
             
-            # inbreeding control:
-            # enfore no reproduction between siblings and parents and their childs.
-            check_0 = pair_combination[0].uuid in (pair_combination[1].parent_1_uuid, pair_combination[1].parent_2_uuid)
-            check_1 = pair_combination[1].uuid in (pair_combination[0].parent_1_uuid, pair_combination[0].parent_2_uuid)
-            check_2 = pair_combination[0].uuid ==  pair_combination[1].uuid
-            
-            if not any([check_0, check_1, check_2]):
+            if not self.isInbreeding(*pair_combination):
                 pairs.append(pair_combination)
             
             # Force the while loop to stop when there not enough possible pairs left.
@@ -203,6 +355,30 @@ class Evolution:
                 break
 
         return pairs
+    
+    def isInbreeding(self, parent_1, parent_2):
+        """
+        Inbreeding control:
+        enfore no reproduction between siblings and parents and their childs.
+
+        Parameters
+        ----------
+        parent_1 : class
+            Individual which should be used for reproduction.
+        parent_2 : class
+            Individual which should be used for reproduction.
+
+        Returns
+        -------
+        bool
+            True if the pair must not be used for reproduction.
+
+        """
+        check_0 = parent_1.uuid in (parent_2.parent_1_uuid, parent_2.parent_2_uuid)
+        check_1 = parent_2.uuid in (parent_1.parent_1_uuid, parent_1.parent_2_uuid)
+        check_2 = parent_1.uuid ==  parent_2.uuid
+        
+        return any([check_0, check_1, check_2])
        
        
     def crossoverCombination(self, crossover_type, parent_1, parent_2):
@@ -273,11 +449,11 @@ class Evolution:
         return x, y, parent_1_share, parent_2_share
 
 
-    def mutate(self, x, y):
+    def mutate(self, x, y, mutation_type="fixed", sigma=None):
         """
         After the share of each parent is calculated the
         values of the parameters x and y will be manipulated
-        by adding a gaussian distributed value with std of 0.1
+        by adding a gaussian distributed value.
 
         Parameters
         ----------
@@ -285,6 +461,26 @@ class Evolution:
             x value of the child individual.
         y : float
             y value of the child individual.
+        mutation_type : str, optional
+            Defines how the standard deviation of the gaussian distribution
+            is choosen, one can choose between four possible options:
+                
+                fixed -> std of 0.1 for every child.
+                
+                one_fifth -> std of self.mutation_std, which is adapted after each
+                                iteration by the 1/5th success rule (see self.adaptMutation).
+                                
+                self_adaptive -> std of sigma, which is inherited from the parents
+                                    and mutated itself (see self.createChild).
+                
+                covariance -> correlated gaussian with covariance 
+                                self.mutation_std**2 * self.mutation_cov, where the
+                                covariance matrix is learned from the successful
+                                mutations (see self.adaptMutation).
+                
+            Default "fixed".
+        sigma : float, optional
+            std of the child individual. Only used if mutation_type = "self_adaptive".
 
         Returns
         -------
@@ -292,12 +488,162 @@ class Evolution:
             Tuple with mutated x and y values.
 
         """
+        if mutation_type == "covariance":
+            step = self.mutation_std * np.linalg.cholesky(self.mutation_cov) @ np.random.normal(0, 1, 2)
+            return x+step[0], y+step[1]
+        
         # calculate standart deviation of gaussian distribution by:
         std = 0.1#*(((abs(x)+abs(y))/2)**(1/4))
+        
+        if mutation_type == "one_fifth":
+            std = self.mutation_std
+            
+        if mutation_type == "self_adaptive":
+            std = sigma
             
         return x+np.random.normal(0, std), y+np.random.normal(0, std)
+    
+    def adaptMutation(self, mutation_type, successful, n_parents):
+        """
+        Adapt the mutation parameters shared by the whole population
+        after the fitness of the children has been calculated.
+        
+        A child counts as successful, if it is better than the worst parent at
+        the time it was created, i.e. if it would enter the set of parents.
+        Comparing with the best parent instead lets the std shrink forever, because
+        a child recombined out of two points of the curved valley rarely beats the
+        better of them, no matter how small the mutation is.
+        
+        For mutation_type = "one_fifth" and "covariance" self.mutation_std is adapted
+        by the 1/5th success rule: If successful children replace more than 1/5 of
+        the parents the std is increased, otherwise it will be decreased.
+        
+        For mutation_type = "covariance" the covariance matrix self.mutation_cov is
+        moved towards the covariance of the successful mutation steps. It is normalized
+        to a determinant of 1, s.t. the step size is only controlled by self.mutation_std.
+
+        Parameters
+        ----------
+        mutation_type : str
+            See documentation of self.mutate.
+        successful : list
+            Successful children of this iteration (or of the adaptation window
+            of the steady-state mode), with calculated fitness values.
+        n_parents : int
+            Number of individuals the children were created from.
+
+        Returns
+        -------
+        None.
+
+        """
+        if mutation_type not in ("one_fifth", "covariance"):
+            return
+        
+        if mutation_type == "covariance" and len(successful) > 0:
+            # normalize the steps by the std they were sampled with
+            steps = np.array([child.mutation_step for child in successful]) / self.mutation_std
+            self.mutation_cov = (1 - self.covariance_learning_rate) * self.mutation_cov\
+                                + self.covariance_learning_rate * (steps.T @ steps) / len(steps)
+            self.mutation_cov /= np.sqrt(np.linalg.det(self.mutation_cov))
+            
+        # 1/5th success rule with the factor 0.817 (recommended by Schwefel)
+        success_rate = len(successful) / n_parents
+        if success_rate > 1/5:
+            self.mutation_std /= 0.817
+        elif success_rate < 1/5:
+            self.mutation_std = max(self.mutation_std * 0.817, 1e-12)
+    
+    def createChild(self, crossover_type, parent_1, parent_2, mutation_type="fixed"):
+        """
+        Create a new individual out of two parents by crossover and mutation.
+        The fitness of the child won't be calculated.
+
+        Parameters
+        ----------
+        crossover_type : str
+            See documentation of self.crossoverCombination.
+        parent_1 : class
+            Individual which will be used as parent of the new created child individual
+        parent_2 : class
+            Individual which will be used as parent of the new created child individual
+        mutation_type : str, optional
+            See documentation of self.mutate. Default "fixed".
+
+        Returns
+        -------
+        child_instance : class
+            New individual without a fitness value.
+
+        """
+        x, y, parent_1_share, parent_2_share = self.crossoverCombination(crossover_type, parent_1, parent_2)
+        
+        # the std of the child is the mean of its parents std, mutated with a log-normal
+        # distribution. The learning rate is below the usual 1/sqrt(n), because the elitist
+        # selection favours small steps and a faster rate lets the std collapse
+        sigma = (parent_1.sigma + parent_2.sigma)/2
+        if mutation_type == "self_adaptive":
+            sigma *= np.exp(np.random.normal(0, 1)*self.self_adaptive_learning_rate)
+        
+        # add gaussian mutation to x and y
+        x_mutated, y_mutated = self.mutate(x, y, mutation_type, sigma)
+        
+        child_instance = PopulationInstance(x_mutated, y_mutated, parent_1.uuid, parent_2.uuid,\
+                                            parent_1_share, parent_2_share, sigma)
+        
+        # store data used to adapt the mutation
+        child_instance.mutation_step = (x_mutated - x, y_mutated - y)
+        
+        return child_instance
+    
+    def screenChildren(self, pairs, crossover_type, mutation_type="fixed"):
+        """
+        Create one child per pair. With the probability unscreened_share
+        the child is created directly, otherwise surrogate_factor many
+        candidates are created and only the one with the best fitness
+        predicted by the surrogate is kept.
+
+        Parameters
+        ----------
+        pairs : list
+            Output of self.selectCrossoverPairs.
+        crossover_type : str
+            See documentation of self.crossoverCombination.
+        mutation_type : str, optional
+            See documentation of self.mutate. Default "fixed".
+
+        Returns
+        -------
+        children : list
+            The most promising candidates, which need to be evaluated by f.
+
+        """
+        children, candidates = [], []
+        for parent_1, parent_2 in pairs:
+            if random.random() < self.unscreened_share:
+                children.append(self.createChild(crossover_type, parent_1, parent_2, mutation_type))
+            else:
+                candidates.append([self.createChild(crossover_type, parent_1, parent_2, mutation_type)\
+                                   for _ in range(self.surrogate_factor)])
+        
+        if len(candidates) == 0:
+            return children
+        
+        flat_candidates = [candidate for pair_candidates in candidates for candidate in pair_candidates]
+        self.n_candidates_screened += len(flat_candidates) - len(candidates)
+        predictions = self.surrogate.predict([candidate.x for candidate in flat_candidates],
+                                             [candidate.y for candidate in flat_candidates])
+        
+        # lower fitness is better, so keep the candidate with the smallest prediction of each pair
+        for pair_candidates, pair_predictions in zip(candidates, predictions.reshape(len(candidates), -1)):
+            index = np.argmin(pair_predictions)
+            pair_candidates[index].predicted_fitness = pair_predictions[index]
+            children.append(pair_candidates[index])
+        
+        return children
             
-    def proceeOneIter(self, n_population_after, select_type, pairing_type, crossover_type, threshold_var):
+    def proceeOneIter(self, n_population_after, select_type, pairing_type, crossover_type, threshold_var,
+                      mutation_type="fixed"):
         """
         Processes one iteration by passing the needed parameters through  every of the function above.
         
@@ -314,6 +660,8 @@ class Evolution:
             See documentation of self.crossoverCombination.
         threshold_var : str
             See documentation of self.selectPopulation.
+        mutation_type : str, optional
+            See documentation of self.mutate.
 
         Returns
         -------
@@ -325,21 +673,192 @@ class Evolution:
         
         # select which instance swill be recombined baised on the pairing_type
         pairs = self.selectCrossoverPairs(pairing_type)
+        n_parents = len(self.population_alive)
+        worst_parent_fitness = max(instance.fitness_value for instance in self.population_alive)
         
-        # calculate the x and y values for the new instance based on the crossover_type
-        for parent_1, parent_2 in pairs:
-            x, y, parent_1_share, parent_2_share = self.crossoverCombination(crossover_type, parent_1, parent_2)
+        # create the new instances based on the crossover_type, if a surrogate is
+        # fitted only the most promising out of more candidates will be kept
+        self.surrogate_errors = []
+        if self.surrogate is not None and self.surrogate.is_fitted:
+            children = self.screenChildren(pairs, crossover_type, mutation_type)
+        else:
+            children = [self.createChild(crossover_type, parent_1, parent_2, mutation_type)\
+                        for parent_1, parent_2 in pairs]
             
-            # add gaussian mutation to x and y
-            x, y = self.mutate(x, y)
+        # reject children that are (nearly) identical to living individuals
+        if self.duplicate_epsilon is not None:
+            self.duplicate_index = SpatialHash(self.duplicate_epsilon, self.population_alive)
+            children = self.rejectDuplicates(children)
+        
+        # calculate fitness for the instances and store them as alive
+        self.evaluateInstances(children)
+        self.population_alive.extend(children)
+        
+        successful = [child for child in children if child.fitness_value < worst_parent_fitness]
+        self.adaptMutation(mutation_type, successful, n_parents)
             
-            # initiate new instance
-            child_instance = PopulationInstance(x, y, parent_1.uuid, parent_2.uuid, parent_1_share, parent_2_share)
+    
+    def buildWorstHeap(self):
+        """
+        Index the living population for the steady-state mode.
+        
+        The worst individuals are tracked by a heap keyed by the negative fitness,
+        s.t. the worst individual is always on top of the heap and can be replaced
+        in O(log n). Every individual also stores its position in self.population_alive
+        which allows to remove it in O(1) by swapping it with the last individual.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.heap_counter = itertools.count()
+        self.worst_heap = []
+        
+        for position, instance in enumerate(self.population_alive):
+            instance.position = position
+            # the counter avoids comparing instances if two fitness values are equal
+            self.worst_heap.append((-instance.fitness_value, next(self.heap_counter), instance))
+        
+        heapq.heapify(self.worst_heap)
+        self.window_successful = []
+        self.window_steps = 0
+        
+        # the duplicate index is updated on every replacement in the steady-state mode
+        if self.duplicate_epsilon is not None:
+            self.duplicate_index = SpatialHash(self.duplicate_epsilon, self.population_alive)
+        
+    def replaceWorst(self, child_instance):
+        """
+        Insert an evaluated child into the population and eliminate the
+        worst individual in O(log n). If the child is worse than every
+        living individual, the child itself will be eliminated.
+        
+        self.buildWorstHeap needs to be called before.
+
+        Parameters
+        ----------
+        child_instance : class
+            Individual with calculated fitness value.
+
+        Returns
+        -------
+        None.
+
+        """
+        entry = (-child_instance.fitness_value, next(self.heap_counter), child_instance)
+        worst = heapq.heappushpop(self.worst_heap, entry)[2]
+        
+        if worst is not child_instance:
+            # move the last individual to the position of the eliminated one
+            last_instance = self.population_alive.pop()
+            if last_instance is not worst:
+                self.population_alive[worst.position] = last_instance
+                last_instance.position = worst.position
             
-            # calculate fitness for instance and store instance as alive
-            child_instance.fitnessFunction(self.f)
+            child_instance.position = len(self.population_alive)
             self.population_alive.append(child_instance)
             
+        worst.is_alive = False
+        self.population_history.append(worst)
+        
+        if self.duplicate_index is not None:
+            self.duplicate_index.remove(worst)
+        
+    def selectSteadyStatePair(self, pairing_type):
+        """
+        Select one pair for reproduction in the steady-state mode.
+        In contrast to self.selectCrossoverPairs the selection doesn't depend
+        on the size of the population.
+
+        Parameters
+        ----------
+        pairing_type : str
+            Takes two possible options:
+                
+                random -> Choose a pair random.
+                
+                tournament -> Each parent is the better one out of two
+                                random individuals.
+                
+            error_based isn't supported, since its weights depend on the
+            fitness of the whole population and would need to be recalculated
+            every step.
+
+        Returns
+        -------
+        pair_combination : list
+            Two individuals used for reproduction.
+
+        """
+        if pairing_type not in ("random", "tournament"):
+            raise ValueError(f"pairing_type '{pairing_type}' isn't supported in the steady-state mode, "
+                             "use 'random' or 'tournament'")
+            
+        # try a limited number of times to avoid inbreeding, like in self.selectCrossoverPairs
+        for _ in range(100):
+            if pairing_type == "random":
+                pair_combination = random.sample(self.population_alive, 2)
+                
+            if pairing_type == "tournament":
+                pair_combination = [min(random.sample(self.population_alive, 2), key=lambda instance: instance.fitness_value)\
+                                    for _ in range(2)]
+                
+            if not self.isInbreeding(*pair_combination):
+                break
+            
+        return pair_combination
+    
+    def steadyStateStep(self, n_children, pairing_type, crossover_type, mutation_type="fixed"):
+        """
+        Processes one step of the steady-state mode. Instead of replacing a batch
+        of individuals every iteration, only n_children are created, which
+        replace the current worst individuals.
+        
+        A few children per step are too few for the 1/5th success rule, so the
+        successful children are collected over a window of N_population/n_children
+        steps, i.e. one replaced population, and the mutation is adapted once
+        per window.
+
+        Parameters
+        ----------
+        n_children : int
+            Number of children created in this step.
+        pairing_type : str
+            See documentation of self.selectSteadyStatePair.
+        crossover_type : str
+            See documentation of self.crossoverCombination.
+        mutation_type : str, optional
+            See documentation of self.mutate.
+
+        Returns
+        -------
+        None.
+
+        """
+        pairs = [self.selectSteadyStatePair(pairing_type) for _ in range(n_children)]
+        
+        if self.surrogate is not None and self.surrogate.is_fitted:
+            children = self.screenChildren(pairs, crossover_type, mutation_type)
+        else:
+            children = [self.createChild(crossover_type, parent_1, parent_2, mutation_type)\
+                        for parent_1, parent_2 in pairs]
+            
+        if self.duplicate_epsilon is not None:
+            children = self.rejectDuplicates(children)
+            
+        self.evaluateInstances(children)
+        for child_instance in children:
+            # the child is successful, if it replaces an individual other than itself
+            if child_instance.fitness_value < -self.worst_heap[0][0]:
+                self.window_successful.append(child_instance)
+            self.replaceWorst(child_instance)
+            
+        self.window_steps += 1
+        if self.window_steps >= max(1, self.N_population // n_children):
+            self.adaptMutation(mutation_type, self.window_successful, self.N_population)
+            self.window_successful = []
+            self.window_steps = 0
     
     def populationStats(self, iteration):
         """
@@ -361,11 +880,20 @@ class Evolution:
         # drop inf values
         df_population = df_population[df_population["f(x,y)"] < 10**8]
         df_stats = df_population.mean()
+        df_stats["best f(x,y)"] = df_population["f(x,y)"].min()
         df_stats["Iteration"] = iteration
+        df_stats["Evaluations"] = self.n_evaluations
+        
+        if self.surrogate is not None:
+            df_stats["Surrogate MAE"] = np.mean(self.surrogate_errors) if self.surrogate_errors else np.nan
+            df_stats["Candidates screened out"] = self.n_candidates_screened
+            
+        if self.duplicate_epsilon is not None:
+            df_stats["Duplicates rejected"] = self.n_duplicates_rejected
         return df_stats
         
     def process(self, n_iters, n_population_after, select_type, pairing_type, crossover_type, threshold_var=None,
-                population_start_x=None, population_start_y=None):
+                population_start_x=None, population_start_y=None, mutation_type="fixed"):
         """
         Processes the whole evolutionary algorithm.
 
@@ -387,6 +915,8 @@ class Evolution:
             See documentation of self.selectPopulation.
         population_start_y : list, optional
             See documentation of self.selectPopulation.
+        mutation_type : str, optional
+            See documentation of self.mutate.
 
         Returns
         -------
@@ -396,17 +926,78 @@ class Evolution:
 
         """
         # create starting values
-        self.initiatePopulation(population_start_x, population_start_x)
-        self.iter_stats = pd.DataFrame()
+        self.initiatePopulation(population_start_x, population_start_y)
         
         # process the iterations and calculate their stats.
+        stats = []
         for i in range(n_iters):
-            self.proceeOneIter( n_population_after, select_type, pairing_type, crossover_type, threshold_var)
-            self.iter_stats = self.iter_stats.append(self.populationStats(i),  ignore_index=True )
+            self.proceeOneIter( n_population_after, select_type, pairing_type, crossover_type, threshold_var,
+                               mutation_type)
+            stats.append(self.populationStats(i))
+            
+        self.iter_stats = pd.DataFrame(stats)
             
         # store further relevant informations in the stats-df.
         self.iter_stats["select_type"] = select_type
         self.iter_stats["pairing_type"] = pairing_type
         self.iter_stats["crossover_type"] = crossover_type
+        self.iter_stats["mutation_type"] = mutation_type
 
         return self.iter_stats
+    
+    def processSteadyState(self, n_steps, n_children, pairing_type, crossover_type, mutation_type="fixed",
+                           stats_every=None, population_start_x=None, population_start_y=None):
+        """
+        Processes the whole evolutionary algorithm in the steady-state mode.
+
+        Parameters
+        ----------
+        n_steps : int
+            Steps that are executed to optimize the fitness values.
+        n_children : int
+            See documentation of self.steadyStateStep.
+        pairing_type : str
+            See documentation of self.selectSteadyStatePair.
+        crossover_type : str
+            See documentation of self.crossoverCombination.
+        mutation_type : str, optional
+            See documentation of self.mutate.
+        stats_every : int, optional
+            Number of steps between two calculations of the statistics.
+            Default None, which calculates them every N_population/n_children steps,
+            i.e. once per replaced population.
+        population_start_x : list, optional
+            See documentation of self.selectPopulation.
+        population_start_y : list, optional
+            See documentation of self.selectPopulation.
+
+        Returns
+        -------
+        pd.DataFrame
+            Statistics about the steps that can be used for plotting
+            the progress of the evolution.
+
+        """
+        if stats_every is None:
+            stats_every = max(1, self.N_population // n_children)
+            
+        # create starting values and index them
+        self.initiatePopulation(population_start_x, population_start_y)
+        self.buildWorstHeap()
+        
+        stats = []
+        for i in range(n_steps):
+            self.steadyStateStep(n_children, pairing_type, crossover_type, mutation_type)
+            if (i + 1) % stats_every == 0:
+                stats.append(self.populationStats(i))
+                self.surrogate_errors = []
+        
+        self.iter_stats = pd.DataFrame(stats)
+        
+        # store further relevant informations in the stats-df.
+        self.iter_stats["select_type"] = "steady_state"
+        self.iter_stats["pairing_type"] = pairing_type
+        self.iter_stats["crossover_type"] = crossover_type
+        self.iter_stats["mutation_type"] = mutation_type
+        
+        return self.iter_stats
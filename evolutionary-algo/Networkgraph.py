@@ -5,10 +5,6 @@ Created on Thu May 27 21:13:08 2021
 @author: Bjarne Gerdes
 """
 
-import pandas as pd
-import plotly.io as pio
-from pyvis.network import Network
-pio.renderers.default = 'browser'
 
 class NetworkPlot:
 
@@ -42,6 +38,9 @@ class NetworkPlot:
         None.
 
         """
+        # imported here, s.t. the module can be imported without the plotting dependencies
+        import pandas as pd
+        
         all_instances = self.evolution_iteration.population_alive + self.evolution_iteration.population_history
         df_all_instances = pd.DataFrame([(instance.fitness_value, instance.x, instance.y, instance.uuid,\
                           instance.parent_1_uuid, instance.parent_1_share,\
@@ -60,6 +59,8 @@ class NetworkPlot:
         None.
 
         """
+        from pyvis.network import Network
+        
         # initialize the network graph
         net = Network(height='100%', width='100%', bgcolor='#222222',\
                       layout=False,font_color='white')
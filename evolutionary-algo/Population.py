@@ -4,6 +4,8 @@ Created on Thu May 27 21:07:55 2021
 
 @author: Bjarne Gerdes
 """
+import asyncio
+import inspect
 import uuid
 
 
@@ -34,7 +36,7 @@ def f(x, y):
 
 class PopulationInstance:
     
-    def __init__(self, x, y, parent_1_uuid, parent_2_uuid, parent_1_share, parent_2_share):
+    def __init__(self, x, y, parent_1_uuid, parent_2_uuid, parent_1_share, parent_2_share, sigma=0.1):
         """
         Represents a an individual. 
 
@@ -52,6 +54,10 @@ class PopulationInstance:
             Share of the parent 1 on the x and y values.
         parent_2_share : float
             Share of the parent 2 on the x and y values.
+        sigma : float, optional
+            Standard deviation of the mutation of the individual, which will
+            be inherited by its children if mutation_type = "self_adaptive".
+            Default 0.1.
 
         Returns
         -------
@@ -71,8 +77,16 @@ class PopulationInstance:
         # initialize uuid of the instance
         self.uuid = str(uuid.uuid4())
         
-        # track if instance is alive
+        # track if instance is alive and its index in the population (steady-state mode)
         self.is_alive = True
+        self.position = None
+        
+        # fitness predicted by a surrogate model, if one was used
+        self.predicted_fitness = None
+        
+        # mutation parameters of the instance
+        self.sigma = sigma
+        self.mutation_step = None
         
     def fitnessFunction(self, f):
         """
@@ -91,3 +105,28 @@ class PopulationInstance:
         """
         self.fitness_value = f(self.x, self.y)
         return self.fitness_value
+    
+    async def fitnessFunctionAsync(self, f, executor=None):
+        """
+        Asynchronous version of self.fitnessFunction.
+        If f isn't an async function, it will be called in a thread of executor.
+
+        Parameters
+        ----------
+        f : function
+            Function that will be optimized.
+        executor : concurrent.futures.Executor, optional
+            Executor that calls a blocking f. Default None, which uses
+            the default executor of the event loop.
+
+        Returns
+        -------
+        float
+            fitness of the individual f(x,y)
+
+        """
+        if inspect.iscoroutinefunction(f) or inspect.iscoroutinefunction(getattr(f, "__call__", None)):
+            self.fitness_value = await f(self.x, self.y)
+        else:
+            self.fitness_value = await asyncio.get_running_loop().run_in_executor(executor, f, self.x, self.y)
+        return self.fitness_value
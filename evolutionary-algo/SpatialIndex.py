@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 13:40:05 2026
+"""
+import math
+
+
+class SpatialHash:
+
+    def __init__(self, cell_size, instances=[]):
+        """
+        Spatial hash over the x and y values of individuals.
+
+        The plane is divided into square cells of size cell_size and every
+        individual is stored in the cell it lies in. Neighbours within a
+        radius of about cell_size can therefore be found by only looking
+        at the surrounding cells, which is roughly O(1) per query instead
+        of comparing the individual with the whole population.
+
+        Parameters
+        ----------
+        cell_size : float
+            Edge length of a cell. Should be about the radius used for
+            the neighbourhood queries.
+        instances : list, optional
+            Individuals which will be inserted. Default [].
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.n_instances = 0
+
+        for instance in instances:
+            self.insert(instance)
+
+    def __len__(self):
+        return self.n_instances
+
+    def cell(self, x, y):
+        """
+        Key of the cell that contains the point (x, y).
+        """
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, instance):
+        """
+        Insert an individual into the cell of its x and y values.
+
+        Parameters
+        ----------
+        instance : class
+            Individual that will be inserted.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cells.setdefault(self.cell(instance.x, instance.y), []).append(instance)
+        self.n_instances += 1
+
+    def remove(self, instance):
+        """
+        Remove an individual from the index.
+
+        Parameters
+        ----------
+        instance : class
+            Individual that was inserted before.
+
+        Returns
+        -------
+        None.
+
+        """
+        key = self.cell(instance.x, instance.y)
+        cell = self.cells[key]
+        cell.remove(instance)
+        if len(cell) == 0:
+            del self.cells[key]
+        self.n_instances -= 1
+
+    def neighbours(self, x, y, radius):
+        """
+        Find all individuals within radius of the point (x, y).
+
+        Parameters
+        ----------
+        x : float
+            x value of the point.
+        y : float
+            y value of the point.
+        radius : float
+            Maximal euclidean distance of the neighbours.
+
+        Returns
+        -------
+        list
+            Tuples (instance, distance) of all neighbours.
+
+        """
+        cell_x, cell_y = self.cell(x, y)
+        n_cells = math.ceil(radius / self.cell_size)
+
+        neighbours = []
+        for i in range(cell_x - n_cells, cell_x + n_cells + 1):
+            for j in range(cell_y - n_cells, cell_y + n_cells + 1):
+                for instance in self.cells.get((i, j), ()):
+                    distance = math.hypot(instance.x - x, instance.y - y)
+                    if distance <= radius:
+                        neighbours.append((instance, distance))
+
+        return neighbours
+
+    def hasNeighbour(self, x, y, radius):
+        """
+        Check if at least one individual is within radius of the point (x, y).
+        Stops at the first neighbour found.
+
+        Parameters
+        ----------
+        x : float
+            x value of the point.
+        y : float
+            y value of the point.
+        radius : float
+            Maximal euclidean distance of the neighbour.
+
+        Returns
+        -------
+        bool
+            True if there is a neighbour.
+
+        """
+        cell_x, cell_y = self.cell(x, y)
+        n_cells = math.ceil(radius / self.cell_size)
+
+        for i in range(cell_x - n_cells, cell_x + n_cells + 1):
+            for j in range(cell_y - n_cells, cell_y + n_cells + 1):
+                for instance in self.cells.get((i, j), ()):
+                    if math.hypot(instance.x - x, instance.y - y) <= radius:
+                        return True
+
+        return False
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:40 2026
+"""
+import numpy as np
+
+
+class QuadraticSurrogate:
+
+    def __init__(self, ridge=1e-6, forgetting=0.98, max_fitness=10**8):
+        """
+        Cheap model of the fitness function, which is used to pre-screen
+        children before their true fitness will be calculated.
+
+        The model is a quadratic regression:
+
+            f(x,y) ≈ c0 + c1*x + c2*y + c3*x**2 + c4*x*y + c5*y**2
+
+        It only stores the normal equations X^T X and X^T f, so it can be
+        refit incrementally after every iteration without keeping all
+        evaluated points in memory.
+        
+        A single quadratic can't follow a curved valley like the one of the
+        Rosenbrock function, so old points are forgotten and the model only
+        approximates f around the recently evaluated points, i.e. around
+        the current population.
+
+        Parameters
+        ----------
+        ridge : float, optional
+            Small value added to the diagonal of X^T X in order to keep the
+            system solvable while only a few points are known.
+            The default is 1e-6.
+        forgetting : float, optional
+            Factor in (0, 1] the weight of every stored point is multiplied
+            with, whenever a new point is added. The weight of a point halves
+            after log(0.5)/log(forgetting) newer points, independent of how
+            many points are added per update. 1.0 fits the model on all
+            points ever seen, which lets the search stall near the minimum
+            of the global quadratic.
+            The default is 0.98, i.e. a half-life of about 34 points.
+        max_fitness : float, optional
+            Points with a fitness value greater or equal to this value
+            won't be used for fitting (see the "drop inf values" in
+            Evolution.populationStats).
+            The default is 10**8.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.ridge = ridge
+        self.forgetting = forgetting
+        self.max_fitness = max_fitness
+
+        # normal equations of the regression
+        self.xtx = np.zeros((6, 6))
+        self.xty = np.zeros(6)
+
+        self.n_points = 0
+        self.coefficients = None
+
+    @property
+    def is_fitted(self):
+        return self.coefficients is not None
+
+    @staticmethod
+    def features(x, y):
+        """
+        Create the quadratic features of the given points.
+
+        Parameters
+        ----------
+        x : array-like
+            x values of the points.
+        y : array-like
+            y values of the points.
+
+        Returns
+        -------
+        np.array
+            Array of shape (n, 6) with the features of each point.
+
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        return np.stack([np.ones_like(x), x, y, x**2, x*y, y**2], axis=-1)
+
+    def update(self, x, y, fitness):
+        """
+        Add evaluated points to the model and refit it.
+
+        Parameters
+        ----------
+        x : array-like
+            x values of the evaluated points.
+        y : array-like
+            y values of the evaluated points.
+        fitness : array-like
+            True fitness values f(x,y) of the points.
+
+        Returns
+        -------
+        None.
+
+        """
+        fitness = np.asarray(fitness, dtype=float)
+        is_valid = fitness < self.max_fitness
+        if not is_valid.any():
+            return
+
+        features = self.features(np.asarray(x)[is_valid], np.asarray(y)[is_valid])
+        n_new = len(features)
+
+        # the i-th of the new points has already been followed by n_new-1-i newer points
+        weights = self.forgetting**np.arange(n_new - 1, -1, -1)
+
+        self.xtx = self.forgetting**n_new*self.xtx + (features*weights[:, None]).T @ features
+        self.xty = self.forgetting**n_new*self.xty + (features*weights[:, None]).T @ fitness[is_valid]
+        self.n_points += n_new
+
+        # at least as many points as coefficients are needed for a meaningful fit
+        if self.n_points >= 6:
+            self.coefficients = np.linalg.solve(self.xtx + self.ridge*np.eye(6), self.xty)
+
+    def predict(self, x, y):
+        """
+        Predict the fitness of the given points.
+
+        Parameters
+        ----------
+        x : array-like
+            x values of the points.
+        y : array-like
+            y values of the points.
+
+        Returns
+        -------
+        np.array
+            Predicted fitness values.
+
+        """
+        return self.features(x, y) @ self.coefficients
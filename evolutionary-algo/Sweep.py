@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 11:02:17 2026
+
+Headless entry point, which runs a sweep over the parameter combinations
+of ProcessAllVariants and writes the statistics of all runs to disk.
+No plotting dependency will be imported.
+
+Example:
+    python Sweep.py --select-type top_n --pairing-type random \
+        --mutation-type fixed one_fifth --n-iters 100 --output runs.csv
+
+Benchmark of the mutation types by the evaluations needed to reach f < 1e-3:
+    python Sweep.py --select-type top_n --pairing-type random --crossover-type random_uniform \
+        --mutation-type fixed one_fifth self_adaptive covariance --n-iters 150 \
+        --seeds 0 1 2 3 4 5 6 7 8 9 --target 1e-3 --output runs.csv
+
+The same with and without the surrogate:
+    python Sweep.py --select-type top_n --pairing-type random --crossover-type random_uniform \
+        --surrogate none quadratic --n-iters 150 \
+        --seeds 0 1 2 3 4 5 6 7 8 9 --target 1e-3 --output runs.csv
+"""
+import argparse
+import pandas as pd
+from Surrogate import QuadraticSurrogate
+from Variants import ProcessAllVariants
+
+
+# surrogates selectable on the command line
+SURROGATES = {"none": None, "quadratic": QuadraticSurrogate}
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line arguments of the sweep.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Arguments to parse. Default None, which uses sys.argv.
+
+    Returns
+    -------
+    argparse.Namespace
+        Parsed arguments.
+
+    """
+    parser = argparse.ArgumentParser(description="Run a sweep of the evolutionary algorithm without plotting.")
+    parser.add_argument("--select-type", nargs="+", default=["threshold", "top_n"])
+    parser.add_argument("--pairing-type", nargs="+", default=["random", "error_based"])
+    parser.add_argument("--crossover-type", nargs="+",
+                        default=["linear", "error_based", "random_uniform", "random_gaussian"])
+    parser.add_argument("--mutation-type", nargs="+", default=["fixed"])
+    parser.add_argument("--n-population", type=int, default=40)
+    parser.add_argument("--n-iters", type=int, default=10)
+    parser.add_argument("--n-population-after", type=int, default=10)
+    parser.add_argument("--threshold-stds", type=float, default=2)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[None],
+                        help="Run every combination once per seed, which makes the runs reproducible.")
+    parser.add_argument("--surrogate", nargs="+", choices=sorted(SURROGATES), default=["none"],
+                        help="Pre-screen the children with a surrogate, \"none quadratic\" compares "
+                             "runs without and with a Surrogate.QuadraticSurrogate.")
+    parser.add_argument("--output", default="runs.csv",
+                        help="CSV file the statistics of every iteration of every run are written to.")
+    parser.add_argument("--target", type=float, default=None,
+                        help="If given, the evaluations needed to reach this fitness are written to "
+                             "<output>_to_target.csv.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    pav = ProcessAllVariants(select_type=args.select_type, pairing_type=args.pairing_type,
+                             crossover_type=args.crossover_type, mutation_type=args.mutation_type,
+                             N_population=args.n_population, n_iters=args.n_iters,
+                             n_population_after=args.n_population_after, threshold_stds=args.threshold_stds,
+                             surrogate=[SURROGATES[name] for name in args.surrogate], seeds=args.seeds)
+    pav.processAll()
+
+    pd.concat(pav.runs).to_csv(args.output, index=False)
+
+    if args.target is not None:
+        output_target = args.output.rsplit(".", 1)[0] + "_to_target.csv"
+        pav.evaluationsToTarget(args.target).to_csv(output_target, index=False)
+
+
+if __name__ == "__main__":
+    main()
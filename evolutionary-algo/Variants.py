@@ -4,9 +4,6 @@ Created on Thu May 27 21:09:32 2021
 
 @author: Bjarne Gerdes
 """
-import plotly.io as pio
-pio.renderers.default = 'browser'
-
 from Population import f
 from Evolution import  Evolution
 import pandas as pd
@@ -18,7 +15,9 @@ class ProcessAllVariants:
     def __init__(self, select_type = ["threshold", "top_n"],
                  pairing_type = ["random", "error_based"],
                  crossover_type = ["linear", "error_based", "random_uniform", "random_gaussian"],
-                 f=f, N_population = 40, n_iters = 10, n_population_after = 10, threshold_stds = 2):
+                 mutation_type = ["fixed"],
+                 f=f, N_population = 40, n_iters = 10, n_population_after = 10, threshold_stds = 2,
+                 surrogate = [None], seeds = [None]):
         """
         This class is used to test each combination of parameters and visualize their training process.
         
@@ -29,6 +28,16 @@ class ProcessAllVariants:
         ----------
             The used parameters won't be exaplained in detail, but one can find a extensive documentation 
             in the file "Evolution.py".
+            
+            surrogate is a list of surrogate classes (e.g. Surrogate.QuadraticSurrogate),
+            where None stands for runs without a surrogate, s.t. [None, QuadraticSurrogate]
+            compares the runs with and without it. Every run gets its own instance
+            of the class. Default [None].
+            
+            seeds is a list of seeds for random and np.random, every combination
+            is run once per seed. This makes the runs reproducible and allows to
+            average evaluationsToTarget over several runs. Default [None],
+            which runs every combination once without seeding.
 
         Returns
         -------
@@ -39,11 +48,14 @@ class ProcessAllVariants:
         self.select_type = select_type
         self.pairing_type = pairing_type
         self.crossover_type = crossover_type
+        self.mutation_type = mutation_type
         self.f = f
         self.N_population = N_population
         self.n_iters = n_iters
         self.n_population_after = n_population_after
         self.threshold_stds = threshold_stds
+        self.surrogate = surrogate
+        self.seeds = seeds
         
         # initialized list, that store the results of each pair of parameters.
         self.runs = []
@@ -67,9 +79,56 @@ class ProcessAllVariants:
         for st in self.select_type:
             for pt in self.pairing_type:
                 for ct in self.crossover_type:
-                    evol = Evolution(self.f, self.N_population)
-                    self.runs.append(evol.process(self.n_iters, self.n_population_after, st, pt, ct, self.threshold_stds))
-                    self.runs_evol.append(evol)
+                    for mt in self.mutation_type:
+                        for sg in self.surrogate:
+                            for seed in self.seeds:
+                                if seed is not None:
+                                    random.seed(seed)
+                                    np.random.seed(seed)
+                                surrogate = sg() if sg is not None else None
+                                evol = Evolution(self.f, self.N_population, surrogate=surrogate)
+                                run = evol.process(self.n_iters, self.n_population_after, st, pt, ct, self.threshold_stds,
+                                                   mutation_type=mt)
+                                run["surrogate"] = sg.__name__ if sg is not None else "none"
+                                run["seed"] = seed
+                                self.runs.append(run)
+                                self.runs_evol.append(evol)
+                    
+    def evaluationsToTarget(self, target):
+        """
+        Benchmark the runs by the number of evaluations of f, that were
+        needed until the best individual reached the target fitness.
+        Can be used to compare the mutation types, e.g.
+        mutation_type = ["fixed", "one_fifth", "self_adaptive", "covariance"],
+        or runs with and without a surrogate. With several seeds the result
+        can be averaged per combination, e.g.
+        df_benchmark.groupby(["mutation_type", "surrogate"])["evaluations"].mean().
+
+        Parameters
+        ----------
+        target : float
+            Fitness value that needs to be reached.
+
+        Returns
+        -------
+        df_benchmark : pandas.DataFrame
+            Evaluations needed by each run, NaN if the target
+            was never reached.
+
+        """
+        benchmark = []
+        for run in self.runs:
+            reached = run[run["best f(x,y)"] <= target]
+            benchmark.append(dict(select_type=run["select_type"].iloc[0],
+                                  pairing_type=run["pairing_type"].iloc[0],
+                                  crossover_type=run["crossover_type"].iloc[0],
+                                  mutation_type=run["mutation_type"].iloc[0],
+                                  surrogate=run["surrogate"].iloc[0],
+                                  seed=run["seed"].iloc[0],
+                                  evaluations=reached["Evaluations"].iloc[0] if len(reached) > 0 else np.nan))
+        
+        df_benchmark = pd.DataFrame(benchmark).sort_values("evaluations")
+        return df_benchmark
                     
     def plotRuns(self):
         """
@@ -81,11 +140,16 @@ class ProcessAllVariants:
         None.
 
         """
+        # plotly is only imported when plotting, s.t. the evolution can run headless
+        import plotly.io as pio
+        pio.renderers.default = 'browser'
+        
         # Create DataFrame for each type
         df_evaluations = pd.concat(self.runs)
         df_evaluations["Kriterien"] = "Selektionkriterium: " + df_evaluations["select_type"] +\
                         " Paarungskriterium: "+df_evaluations["pairing_type"] +\
-                        " Crossover-Kriterium: "+df_evaluations["crossover_type"]
+                        " Crossover-Kriterium: "+df_evaluations["crossover_type"] +\
+                        " Mutation: "+df_evaluations["mutation_type"]
         self.df_evaluations = df_evaluations
         
         # plot the data
@@ -0,0 +1,716 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 10:05:44 2026
+
+Vereinfachte 2D-Simulation der Arena ohne Webots, um die Parameter der
+CollectorLogik in vielen Episoden parallel zu bewerten.
+
+Beispiel für die Optimierung mit dem evolutionären Algorithmus:
+    sys.path.append("../../evolutionary-algo")
+    from Evolution import Evolution
+    with ArenaObjective(("sensitivity_factor", "min_action"), n_episodes=16) as objective:
+        evol = Evolution(objective, 40, evaluator=objective)
+        evol.process(20, 10, "top_n", "random", "linear")
+"""
+import inspect
+import math
+import os
+import threading
+from multiprocessing import Pool
+import numpy as np
+from rulebasedAlgo import CollectorLogik, BatchCollectorLogik, sector_indices
+
+
+# Farben der Bälle (rot, grün, blau) im BGRA-Format von camera.getImage()
+BALL_COLORS = np.array([[30, 30, 200, 255],
+                        [30, 200, 30, 255],
+                        [200, 30, 30, 255]], dtype=np.uint8)
+FLOOR_COLOR = np.array([110, 110, 110, 255], dtype=np.uint8)
+SKY_COLOR = np.array([170, 160, 150, 255], dtype=np.uint8)
+
+# Abmessungen des e-pucks in Metern
+WHEEL_RADIUS = 0.0205
+AXLE_LENGTH = 0.052
+MAX_VELOCITY = 6.28
+
+
+class ArenaSimulator:
+
+    def __init__(self, collector_kwargs={}, width=52, height=39, arena_size=1.0, n_steps=500,
+                 timestep=0.064, field_of_view=0.84, camera_height=0.035, ball_radius=0.02,
+                 collect_radius=0.05, max_balls=8, spawn_probability=0.02, ball_lifetime=600,
+                 ball_points=(1, -1, 2), seed=None):
+        """
+        Simuliert einen e-puck mit Differentialantrieb in einer quadratischen Arena,
+        in der zufällig rote, grüne und blaue Bälle erscheinen und nach einer
+        zufälligen Zeit wieder verschwinden. Das Kamerabild wird im gleichen Format
+        wie camera.getImage() gerendert und durch die CollectorLogik verarbeitet.
+
+        Parameters
+        ----------
+        collector_kwargs : dict, optional
+            Parameter der CollectorLogik. The default is {}.
+        width : int, optional
+            Breite des Kamerabildes. The default is 52.
+        height : int, optional
+            Höhe des Kamerabildes. The default is 39.
+        arena_size : float, optional
+            Kantenlänge der Arena in Metern. The default is 1.0.
+        n_steps : int, optional
+            Anzahl der Schritte einer Episode. The default is 500.
+        timestep : float, optional
+            Dauer eines Schritts in Sekunden. The default is 0.064.
+        field_of_view : float, optional
+            Horizontaler Öffnungswinkel der Kamera. The default is 0.84.
+        camera_height : float, optional
+            Höhe der Kamera über dem Boden in Metern. The default is 0.035.
+        ball_radius : float, optional
+            Radius der Bälle in Metern. The default is 0.02.
+        collect_radius : float, optional
+            Abstand zum Mittelpunkt des Roboters, ab dem ein Ball eingesammelt wird.
+            The default is 0.05.
+        max_balls : int, optional
+            Maximale Anzahl gleichzeitig vorhandener Bälle. The default is 8.
+        spawn_probability : float, optional
+            Wahrscheinlichkeit pro Schritt, dass ein neuer Ball erscheint.
+            The default is 0.02.
+        ball_lifetime : int, optional
+            Mittlere Anzahl an Schritten, bis ein Ball verschwindet. The default is 600.
+        ball_points : tuple, optional
+            Punkte für das Einsammeln eines roten, grünen und blauen Balls.
+            The default is (1, -1, 2).
+        seed : int, optional
+            Startwert des Zufallsgenerators. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.collector_kwargs = collector_kwargs
+        self.width = width
+        self.height = height
+        self.arena_size = arena_size
+        self.n_steps = n_steps
+        self.timestep = timestep
+        self.field_of_view = field_of_view
+        self.camera_height = camera_height
+        self.ball_radius = ball_radius
+        self.collect_radius = collect_radius
+        self.max_balls = max_balls
+        self.spawn_probability = spawn_probability
+        self.ball_lifetime = ball_lifetime
+        self.ball_points = np.array(ball_points)
+        self.rng = np.random.default_rng(seed)
+
+        # Brennweite in Pixeln und Koordinaten der Pixel für das Rendern
+        self.focal_length = (width/2)/math.tan(field_of_view/2)
+        self.pixel_rows, self.pixel_columns = np.ogrid[:height, :width]
+        self.background = np.empty((height, width, 4), dtype=np.uint8)
+        self.background[:height//2] = SKY_COLOR
+        self.background[height//2:] = FLOOR_COLOR
+
+        self.reset()
+
+    def reset(self):
+        """
+        Startet eine neue Episode mit zufälliger Position des Roboters
+        und zufällig verteilten Bällen.
+        """
+        self.collector = CollectorLogik(**self.collector_kwargs)
+        self.position = self.rng.uniform(0.1, self.arena_size - 0.1, 2)
+        self.heading = self.rng.uniform(-math.pi, math.pi)
+
+        # Position, Farbe und verbleibende Lebensdauer der Bälle
+        self.ball_positions = np.empty((0, 2))
+        self.ball_colors = np.empty(0, dtype=int)
+        self.ball_ttl = np.empty(0)
+        for _ in range(self.max_balls//2):
+            self.spawn_ball()
+
+        self.score = 0
+        self.collected = np.zeros(3, dtype=int)
+
+    def spawn_ball(self):
+        """
+        Lässt einen Ball mit zufälliger Farbe an einer zufälligen Position erscheinen.
+        """
+        margin = self.ball_radius
+        self.ball_positions = np.vstack([self.ball_positions, self.rng.uniform(margin, self.arena_size - margin, 2)])
+        self.ball_colors = np.append(self.ball_colors, self.rng.integers(0, 3))
+        self.ball_ttl = np.append(self.ball_ttl, self.rng.exponential(self.ball_lifetime))
+
+    def render(self):
+        """
+        Rendert das Kamerabild des Roboters als Lochkamera: Jeder Ball vor dem
+        Roboter wird als Kreis dargestellt, dessen Größe und vertikale Position
+        von der Entfernung abhängen. Nähere Bälle verdecken entferntere.
+
+        Returns
+        -------
+        frame : np.array
+            Bild im Format von camera.getImage() (Höhe x Breite x BGRA).
+
+        """
+        frame = self.background.copy()
+        if len(self.ball_positions) == 0:
+            return frame
+
+        # Koordinaten der Bälle relativ zum Roboter (forward nach vorne, lateral nach links)
+        offset = self.ball_positions - self.position
+        cos_heading, sin_heading = math.cos(self.heading), math.sin(self.heading)
+        forward = offset[:,0]*cos_heading + offset[:,1]*sin_heading
+        lateral = -offset[:,0]*sin_heading + offset[:,1]*cos_heading
+
+        is_visible = forward > self.ball_radius
+        if not is_visible.any():
+            return frame
+        forward, lateral, colors = forward[is_visible], lateral[is_visible], self.ball_colors[is_visible]
+
+        # Projektion auf die Bildebene, links im Bild entspricht kleinen Spalten
+        column = self.width/2 - self.focal_length*lateral/forward
+        row = self.height/2 + self.focal_length*(self.camera_height - self.ball_radius)/forward
+        radius = self.focal_length*self.ball_radius/forward
+
+        is_covered = (self.pixel_columns[None] - column[:,None,None])**2\
+                     + (self.pixel_rows[None] - row[:,None,None])**2 <= radius[:,None,None]**2
+
+        # pro Pixel den nächsten Ball bestimmen, der ihn verdeckt
+        depth = np.where(is_covered, forward[:,None,None], np.inf)
+        nearest = depth.argmin(axis=0)
+        is_ball = is_covered.any(axis=0)
+        frame[is_ball] = BALL_COLORS[colors[nearest[is_ball]]]
+
+        return frame
+
+    def step(self, v_left, v_right):
+        """
+        Bewegt den Roboter mit den gegebenen Radgeschwindigkeiten einen Schritt,
+        sammelt erreichte Bälle ein und lässt Bälle erscheinen und verschwinden.
+
+        Parameters
+        ----------
+        v_left : float
+            Velocity des linken Rads.
+        v_right : float
+           Velocity des rechten Rads.
+
+        Returns
+        -------
+        None.
+
+        """
+        v_left = min(max(v_left, -MAX_VELOCITY), MAX_VELOCITY)
+        v_right = min(max(v_right, -MAX_VELOCITY), MAX_VELOCITY)
+
+        # Kinematik des Differentialantriebs
+        velocity = WHEEL_RADIUS*(v_left + v_right)/2
+        angular_velocity = WHEEL_RADIUS*(v_right - v_left)/AXLE_LENGTH
+        self.heading += angular_velocity*self.timestep
+        self.position += velocity*self.timestep*np.array([math.cos(self.heading), math.sin(self.heading)])
+        self.position = np.clip(self.position, 0.04, self.arena_size - 0.04)
+
+        # Bälle in Reichweite einsammeln
+        distance = np.hypot(*(self.ball_positions - self.position).T)
+        is_collected = distance <= self.collect_radius
+        if is_collected.any():
+            collected_colors = self.ball_colors[is_collected]
+            self.score += self.ball_points[collected_colors].sum()
+            self.collected += np.bincount(collected_colors, minlength=3)
+
+        # Bälle verschwinden, wenn sie eingesammelt wurden oder ihre Lebensdauer abgelaufen ist
+        self.ball_ttl -= 1
+        is_kept = ~is_collected & (self.ball_ttl > 0)
+        self.ball_positions = self.ball_positions[is_kept]
+        self.ball_colors = self.ball_colors[is_kept]
+        self.ball_ttl = self.ball_ttl[is_kept]
+
+        if len(self.ball_colors) < self.max_balls and self.rng.random() < self.spawn_probability:
+            self.spawn_ball()
+
+    def run_episode(self):
+        """
+        Führt eine komplette Episode aus.
+
+        Returns
+        -------
+        float
+            Erzielte Punkte der Episode.
+
+        """
+        self.reset()
+        for _ in range(self.n_steps):
+            frame = self.render()
+            v_left, v_right = self.collector.choose(frame, self.width, self.height)
+            self.step(v_left, v_right)
+
+        return float(self.score)
+
+
+class BatchArenaSimulator:
+
+    def __init__(self, collector_kwargs, seeds, width=52, height=39, arena_size=1.0, n_steps=500,
+                 timestep=0.064, field_of_view=0.84, camera_height=0.035, ball_radius=0.02,
+                 collect_radius=0.05, max_balls=8, spawn_probability=0.02, ball_lifetime=600,
+                 ball_points=(1, -1, 2)):
+        """
+        Simuliert viele Arenen des ArenaSimulator gleichzeitig. Position, Bälle und
+        Kamerabilder aller Arenen werden als Arrays gehalten und in jedem Schritt
+        gemeinsam aktualisiert, die Bilder aller Roboter werden mit einem Aufruf
+        von BatchCollectorLogik.choose verarbeitet.
+
+        Alle Zufallswerte einer Arena (Startposition, Bälle und deren Erscheinen)
+        werden zu Beginn der Episode aus ihrem Startwert gezogen. Arenen mit dem
+        gleichen Startwert starten daher gleich und erhalten die gleichen Bälle,
+        solange sich die Roboter gleich verhalten, unabhängig von den übrigen Arenen.
+
+        Parameters
+        ----------
+        collector_kwargs : list
+            Parameter der BatchCollectorLogik pro Arena als dicts (rewards,
+            sector_weights, sensitivity_factor, min_velocity, min_action und
+            smoothing_window, letzterer für alle Arenen gleich).
+        seeds : list
+            Startwert pro Arena.
+        **other :
+            Siehe ArenaSimulator.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.n_arenas = len(seeds)
+        self.collector_kwargs = collector_kwargs
+        self.seeds = seeds
+        self.width = width
+        self.height = height
+        self.arena_size = arena_size
+        self.n_steps = n_steps
+        self.timestep = timestep
+        self.camera_height = camera_height
+        self.ball_radius = ball_radius
+        self.collect_radius = collect_radius
+        self.max_balls = max_balls
+        self.spawn_probability = spawn_probability
+        self.ball_lifetime = ball_lifetime
+        self.ball_points = np.array(ball_points)
+
+        self.focal_length = (width/2)/math.tan(field_of_view/2)
+        self.background = np.empty((height, width, 4), dtype=np.uint8)
+        self.background[:height//2] = SKY_COLOR
+        self.background[height//2:] = FLOOR_COLOR
+
+        # Sektor jedes Pixels des flachgedrückten Bildes wie bei sector_indices,
+        # Pixel zwischen dem vierten und fünften Sektor erhalten den ignorierten Sektor 5
+        bounds = sector_indices((width, height))
+        self.pixel_sectors = np.full(width*height, 5)
+        for sector, start in enumerate(bounds[::2]):
+            self.pixel_sectors[start:start + bounds[1]] = sector
+
+        self.reset()
+
+    def __collector(self):
+        """
+        Erstellt die BatchCollectorLogik mit den Parametern aller Arenen.
+        """
+        defaults = inspect.signature(BatchCollectorLogik).parameters
+        names = set().union(*self.collector_kwargs)
+        # unbekannte Parameter werden an BatchCollectorLogik weitergegeben, die dafür einen TypeError wirft
+        kwargs = {name: [params.get(name, getattr(defaults.get(name), "default", None)) for params in self.collector_kwargs]
+                  for name in names}
+
+        if "smoothing_window" in kwargs:
+            if len(set(kwargs["smoothing_window"])) > 1:
+                raise ValueError("smoothing_window muss für alle Arenen gleich sein")
+            kwargs["smoothing_window"] = kwargs["smoothing_window"][0]
+
+        return BatchCollectorLogik(self.n_arenas, **kwargs)
+
+    def reset(self):
+        """
+        Startet in allen Arenen eine neue Episode und zieht alle Zufallswerte der Episode.
+        """
+        self.collector = self.__collector()
+        n, margin = self.n_arenas, self.ball_radius
+
+        self.position = np.empty((n, 2))
+        self.heading = np.empty(n)
+
+        # Bälle in festen Plätzen pro Arena, is_ball markiert die belegten
+        self.ball_positions = np.zeros((n, self.max_balls, 2))
+        self.ball_colors = np.zeros((n, self.max_balls), dtype=int)
+        self.ball_ttl = np.zeros((n, self.max_balls))
+        self.is_ball = np.zeros((n, self.max_balls), dtype=bool)
+
+        # Zufallswerte für das Erscheinen eines Balls in jedem Schritt
+        self.spawn_draws = np.empty((n, self.n_steps))
+        self.spawn_positions = np.empty((n, self.n_steps, 2))
+        self.spawn_colors = np.empty((n, self.n_steps), dtype=int)
+        self.spawn_ttl = np.empty((n, self.n_steps))
+
+        n_initial = self.max_balls//2
+        for arena, seed in enumerate(self.seeds):
+            rng = np.random.default_rng(seed)
+            self.position[arena] = rng.uniform(0.1, self.arena_size - 0.1, 2)
+            self.heading[arena] = rng.uniform(-math.pi, math.pi)
+            self.ball_positions[arena,:n_initial] = rng.uniform(margin, self.arena_size - margin, (n_initial, 2))
+            self.ball_colors[arena,:n_initial] = rng.integers(0, 3, n_initial)
+            self.ball_ttl[arena,:n_initial] = rng.exponential(self.ball_lifetime, n_initial)
+            self.spawn_draws[arena] = rng.random(self.n_steps)
+            self.spawn_positions[arena] = rng.uniform(margin, self.arena_size - margin, (self.n_steps, 2))
+            self.spawn_colors[arena] = rng.integers(0, 3, self.n_steps)
+            self.spawn_ttl[arena] = rng.exponential(self.ball_lifetime, self.n_steps)
+        self.is_ball[:,:n_initial] = True
+
+        self.n_step = 0
+        self.score = np.zeros(n)
+        self.collected = np.zeros((n, 3), dtype=int)
+
+    def rasterize(self):
+        """
+        Bestimmt wie ArenaSimulator.render die Pixel aller Roboter, die von einem
+        Ball verdeckt werden, ohne die Bilder zu erzeugen: Für jeden sichtbaren
+        Ball werden nur die Pixel innerhalb seines Begrenzungsrechtecks geprüft
+        und pro Pixel gewinnt der nächste Ball.
+
+        Returns
+        -------
+        pixels : np.array
+            Index der verdeckten Pixel, arena*Breite*Höhe + Spalte*Höhe + Zeile,
+            also in der Reihenfolge des flachgedrückten Bildes der CollectorLogik.
+        colors : np.array
+            Farbe des nächsten Balls pro Pixel.
+
+        """
+        offset = self.ball_positions - self.position[:,None]
+        cos_heading, sin_heading = np.cos(self.heading)[:,None], np.sin(self.heading)[:,None]
+        forward = offset[...,0]*cos_heading + offset[...,1]*sin_heading
+        lateral = -offset[...,0]*sin_heading + offset[...,1]*cos_heading
+        is_visible = self.is_ball & (forward > self.ball_radius)
+
+        # sichtbare Bälle nach aufsteigender Entfernung, damit pro Pixel der erste Eintrag der nächste ist
+        arenas, slots = np.nonzero(is_visible)
+        order = np.argsort(forward[arenas, slots], kind="stable")
+        arenas, slots = arenas[order], slots[order]
+        forward, lateral = forward[arenas, slots], lateral[arenas, slots]
+        colors = self.ball_colors[arenas, slots]
+
+        column = self.width/2 - self.focal_length*lateral/forward
+        row = self.height/2 + self.focal_length*(self.camera_height - self.ball_radius)/forward
+        radius = self.focal_length*self.ball_radius/forward
+
+        # Begrenzungsrechtecke im Bild, leere Rechtecke erhalten die Größe 0
+        first_column = np.clip(np.ceil(column - radius), 0, self.width).astype(int)
+        first_row = np.clip(np.ceil(row - radius), 0, self.height).astype(int)
+        n_columns = np.maximum(np.clip(np.floor(column + radius) + 1, 0, self.width).astype(int) - first_column, 0)
+        n_rows = np.maximum(np.clip(np.floor(row + radius) + 1, 0, self.height).astype(int) - first_row, 0)
+
+        # alle Pixel der Rechtecke als eine flache Liste
+        n_pixels = n_columns*n_rows
+        ball = np.repeat(np.arange(len(n_pixels)), n_pixels)
+        local = np.arange(n_pixels.sum()) - np.repeat(np.cumsum(n_pixels) - n_pixels, n_pixels)
+        pixel_column = first_column[ball] + local//n_rows[ball]
+        pixel_row = first_row[ball] + local % n_rows[ball]
+
+        is_covered = (pixel_column - column[ball])**2 + (pixel_row - row[ball])**2 <= radius[ball]**2
+        ball = ball[is_covered]
+        pixels = (arenas[ball]*self.width + pixel_column[is_covered])*self.height + pixel_row[is_covered]
+
+        pixels, first = np.unique(pixels, return_index=True)
+        return pixels, colors[ball[first]]
+
+    def pixel_counts(self):
+        """
+        Zählt die Pixel der Bälle pro Roboter, Sektor und Farbe für
+        BatchCollectorLogik.choose_counts.
+
+        Returns
+        -------
+        np.array
+            Anzahl der Pixel (Anzahl x 5 x RGB).
+
+        """
+        pixels, colors = self.rasterize()
+        n_image = self.width*self.height
+        sectors = self.pixel_sectors[pixels % n_image]
+        counts = np.bincount((pixels//n_image*6 + sectors)*3 + colors, minlength=self.n_arenas*18)
+
+        return counts.reshape(self.n_arenas, 6, 3)[:,:5]
+
+    def render(self):
+        """
+        Rendert die Kamerabilder aller Roboter wie ArenaSimulator.render.
+
+        Returns
+        -------
+        frames : np.array
+            Bilder im Format von camera.getImage() (Anzahl x Höhe x Breite x BGRA).
+
+        """
+        pixels, colors = self.rasterize()
+        frames = np.broadcast_to(self.background, (self.n_arenas,) + self.background.shape).copy()
+        arenas, pixels = np.divmod(pixels, self.width*self.height)
+        frames[(arenas,) + np.divmod(pixels, self.height)[::-1]] = BALL_COLORS[colors]
+
+        return frames
+
+    def step(self, velocity):
+        """
+        Bewegt alle Roboter wie ArenaSimulator.step einen Schritt.
+
+        Parameters
+        ----------
+        velocity : np.array
+            Velocity-Werte (Anzahl x 2) mit den Spalten links und rechts.
+
+        Returns
+        -------
+        None.
+
+        """
+        velocity = np.clip(velocity, -MAX_VELOCITY, MAX_VELOCITY)
+        v_left, v_right = velocity[:,0], velocity[:,1]
+
+        speed = WHEEL_RADIUS*(v_left + v_right)/2
+        angular_velocity = WHEEL_RADIUS*(v_right - v_left)/AXLE_LENGTH
+        self.heading += angular_velocity*self.timestep
+        self.position[:,0] += speed*self.timestep*np.cos(self.heading)
+        self.position[:,1] += speed*self.timestep*np.sin(self.heading)
+        np.clip(self.position, 0.04, self.arena_size - 0.04, out=self.position)
+
+        offset = self.ball_positions - self.position[:,None]
+        is_collected = self.is_ball & (np.hypot(offset[...,0], offset[...,1]) <= self.collect_radius)
+        if is_collected.any():
+            self.score += np.where(is_collected, self.ball_points[self.ball_colors], 0).sum(axis=1)
+            for color in range(3):
+                self.collected[:,color] += (is_collected & (self.ball_colors == color)).sum(axis=1)
+
+        self.ball_ttl -= 1
+        self.is_ball &= ~is_collected & (self.ball_ttl > 0)
+
+        # in den ersten freien Platz der Arenen, in denen ein Ball erscheint
+        is_spawned = (self.is_ball.sum(axis=1) < self.max_balls) & (self.spawn_draws[:,self.n_step] < self.spawn_probability)
+        if is_spawned.any():
+            arenas = np.flatnonzero(is_spawned)
+            slots = self.is_ball[arenas].argmin(axis=1)
+            self.ball_positions[arenas, slots] = self.spawn_positions[arenas, self.n_step]
+            self.ball_colors[arenas, slots] = self.spawn_colors[arenas, self.n_step]
+            self.ball_ttl[arenas, slots] = self.spawn_ttl[arenas, self.n_step]
+            self.is_ball[arenas, slots] = True
+
+        self.n_step += 1
+
+    def run_episodes(self, render_frames=False):
+        """
+        Führt in allen Arenen eine komplette Episode aus.
+
+        Parameters
+        ----------
+        render_frames : bool, optional
+            Ob die Bilder gerendert und mit BatchCollectorLogik.choose gefiltert
+            werden, anstatt die Pixel der Bälle direkt zu zählen. Beides liefert
+            die gleichen Ergebnisse, ersteres ist jedoch deutlich langsamer.
+            The default is False.
+
+        Returns
+        -------
+        np.array
+            Erzielte Punkte pro Arena.
+
+        """
+        self.reset()
+        for _ in range(self.n_steps):
+            if render_frames:
+                velocity = self.collector.choose(self.render(), self.width, self.height)
+            else:
+                velocity = self.collector.choose_counts(self.pixel_counts())
+            self.step(velocity)
+
+        return self.score.copy()
+
+
+def run_batch_task(task):
+    """
+    Führt die Episoden eines Teils der Arenen für den Prozess-Pool aus.
+
+    Parameters
+    ----------
+    task : tuple
+        Parameter der BatchCollectorLogik pro Arena, Startwerte und Parameter des Simulators.
+
+    Returns
+    -------
+    np.array
+        Erzielte Punkte pro Arena.
+
+    """
+    collector_kwargs, seeds, simulator_kwargs = task
+    return BatchArenaSimulator(collector_kwargs, seeds, **simulator_kwargs).run_episodes()
+
+
+def evaluate_parameters(parameter_sets, n_episodes=16, processes=None, seed=0, pool=None,
+                        min_batch=32, **simulator_kwargs):
+    """
+    Bewertet mehrere Parametersätze der CollectorLogik durch die mittleren Punkte
+    über n_episodes Episoden. Die Arenen aller Parametersätze und Episoden werden
+    mit dem BatchArenaSimulator gemeinsam simuliert und dafür auf einen Prozess-Pool
+    verteilt. Alle Parametersätze werden mit den gleichen Startwerten simuliert,
+    um sie vergleichbar zu machen.
+
+    Parameters
+    ----------
+    parameter_sets : list
+        Parameter der BatchCollectorLogik als dicts, smoothing_window muss
+        für alle gleich sein.
+    n_episodes : int, optional
+        Anzahl der Episoden pro Parametersatz. The default is 16.
+    processes : int, optional
+        Anzahl der Prozesse. The default is None, also die Anzahl der CPUs.
+    seed : int, optional
+        Startwert der ersten Episode. The default is 0.
+    pool : multiprocessing.Pool, optional
+        Bereits gestarteter Pool, der wiederverwendet wird. The default is None.
+    min_batch : int, optional
+        Minimale Anzahl der Arenen pro Prozess, da kleinere Batches kaum
+        schneller als größere simuliert werden. The default is 32.
+    **simulator_kwargs :
+        Parameter des BatchArenaSimulator.
+
+    Returns
+    -------
+    np.array
+        Mittlere Punkte pro Parametersatz.
+
+    """
+    collector_kwargs = [params for params in parameter_sets for _ in range(n_episodes)]
+    seeds = [seed + episode for _ in parameter_sets for episode in range(n_episodes)]
+
+    n_batches = max(1, min(processes or os.cpu_count(), len(seeds)//min_batch))
+    bounds = np.linspace(0, len(seeds), n_batches + 1).astype(int)
+    tasks = [(collector_kwargs[start:end], seeds[start:end], simulator_kwargs)
+             for start, end in zip(bounds[:-1], bounds[1:])]
+
+    if n_batches == 1:
+        scores = [run_batch_task(tasks[0])]
+    elif pool is None:
+        with Pool(processes) as pool:
+            scores = pool.map(run_batch_task, tasks)
+    else:
+        scores = pool.map(run_batch_task, tasks)
+
+    return np.concatenate(scores).reshape(len(parameter_sets), n_episodes).mean(axis=1)
+
+
+class ArenaObjective:
+
+    def __init__(self, param_names=("sensitivity_factor", "min_action"), bounds=((0.5, 10), (0, 10)),
+                 base_params={}, n_episodes=16, processes=None, seed=0, **simulator_kwargs):
+        """
+        Zielfunktion f(x, y) für Evolution.Evolution, die zwei Parameter der
+        CollectorLogik durch Simulation bewertet. Da der evolutionäre Algorithmus
+        minimiert, werden die negativen mittleren Punkte zurückgegeben. Wie bei
+        Population.f wird außerhalb der Grenzen 10**8 zurückgegeben.
+
+        Die Episoden werden mit evaluate_parameters simuliert und auf einen
+        Prozess-Pool verteilt, der beim ersten Aufruf gestartet und von close
+        bzw. beim Verlassen des with-Blocks beendet wird. Als evaluator der
+        Evolution werden die Episoden aller Kinder einer Iteration gemeinsam
+        simuliert, was deutlich schneller ist als einzelne Aufrufe.
+
+        Hinweis: pairing_type bzw. crossover_type "error_based" setzen positive
+        Fitnesswerte voraus und sind daher mit dieser Zielfunktion nicht sinnvoll.
+
+        Parameters
+        ----------
+        param_names : tuple, optional
+            Namen der Parameter der BatchCollectorLogik, die x und y entsprechen.
+            The default is ("sensitivity_factor", "min_action").
+        bounds : tuple, optional
+            Erlaubte Intervalle (min, max) für x und y.
+            The default is ((0.5, 10), (0, 10)).
+        base_params : dict, optional
+            Weitere, feste Parameter der BatchCollectorLogik. The default is {}.
+        n_episodes : int, optional
+            Anzahl der Episoden pro Bewertung. The default is 16.
+        processes : int, optional
+            Anzahl der Prozesse. The default is None, also die Anzahl der CPUs.
+        seed : int, optional
+            Startwert der ersten Episode. The default is 0.
+        **simulator_kwargs :
+            Parameter des BatchArenaSimulator.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.param_names = param_names
+        self.bounds = bounds
+        self.base_params = base_params
+        self.n_episodes = n_episodes
+        self.processes = processes
+        self.seed = seed
+        self.simulator_kwargs = simulator_kwargs
+        self.pool = None
+        self.pool_lock = threading.Lock()
+
+    def __call__(self, x, y):
+        return self.evaluate_points([(x, y)])[0]
+
+    def evaluate(self, instances, f):
+        """
+        Schnittstelle des evaluator der Evolution: Bewertet alle Individuen
+        mit einem Aufruf von evaluate_parameters.
+        """
+        for instance, fitness_value in zip(instances, self.evaluate_points([(instance.x, instance.y) for instance in instances])):
+            instance.fitness_value = fitness_value
+
+    def evaluate_points(self, points):
+        """
+        Bewertet mehrere Punkte (x, y) gemeinsam.
+
+        Parameters
+        ----------
+        points : list
+            Punkte (x, y).
+
+        Returns
+        -------
+        list
+            Fitnesswerte der Punkte.
+
+        """
+        fitness_values = [10**8]*len(points)
+        inside = [i for i, point in enumerate(points)
+                  if all(low <= value <= high for value, (low, high) in zip(point, self.bounds))]
+        if not inside:
+            return fitness_values
+
+        # mehrere Threads (bspw. des AsyncEvaluator) teilen sich einen Pool
+        with self.pool_lock:
+            if self.pool is None:
+                self.pool = Pool(self.processes)
+
+        parameter_sets = [dict(self.base_params, **dict(zip(self.param_names, points[i]))) for i in inside]
+        scores = evaluate_parameters(parameter_sets, self.n_episodes, self.processes, seed=self.seed,
+                                     pool=self.pool, **self.simulator_kwargs)
+        for i, score in zip(inside, scores):
+            fitness_values[i] = -float(score)
+
+        return fitness_values
+
+    def close(self):
+        """
+        Beendet den Prozess-Pool.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:05:33 2026
+
+Benchmarks der CollectorLogik, die ohne Webots ausgeführt werden können:
+    python benchmark.py
+"""
+import argparse
+import time
+import numpy as np
+from rulebasedAlgo import CollectorLogik, BatchCollectorLogik
+from stubs import StubCamera, rgb_to_bgra
+from recording import load_frames
+
+
+# Einstellungen der Auflösung, die in resolution_report verglichen werden
+RESOLUTION_SETTINGS = [dict(stride=2), dict(stride=4),
+                       dict(stride=2, downsampling="block"), dict(stride=4, downsampling="block"),
+                       dict(roi=(0.5, 1)), dict(roi=(0.5, 1), stride=2)]
+
+
+def random_frame(width, height, n_balls=4, rng=None):
+    """
+    Erzeugt ein zufälliges Kamerabild im Format von camera.getImageArray()
+    (Breite x Höhe x RGB) mit grauem Hintergrund und einigen farbigen Bällen.
+
+    Parameters
+    ----------
+    width : int
+        Breite des Bildes.
+    height : int
+        Höhe des Bildes.
+    n_balls : int, optional
+        Anzahl der Bälle im Bild. The default is 4.
+    rng : np.random.Generator, optional
+        Zufallsgenerator. The default is None.
+
+    Returns
+    -------
+    np.array
+        Bild mit den Dimensionen (width, height, 3).
+
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    frame = rng.integers(60, 140, size=(width, height, 3))
+
+    x, y = np.ogrid[:width, :height]
+    for _ in range(n_balls):
+        center_x, center_y = rng.integers(0, width), rng.integers(height//2, height)
+        radius = rng.integers(1, max(2, height//4))
+        color = np.zeros(3, dtype=int)
+        color[rng.integers(0, 3)] = rng.integers(150, 256)
+        frame[(x - center_x)**2 + (y - center_y)**2 <= radius**2] = color
+
+    return frame
+
+
+def reference_score(image):
+    """
+    Ursprüngliche Berechnung der Scores für eine einzelne Farbe,
+    wird genutzt um die Ergebnisse der vektorisierten Berechnung zu prüfen.
+    """
+    filtered_img = image.flatten()
+    len_pixels = len(filtered_img)
+    hard_left_score = sum(filtered_img[:int(len_pixels/5)] > 0)**.5
+    soft_left_score = sum(filtered_img[int(len_pixels/5):int(len_pixels/5)*2] > 0 )**.5
+    neutral_score = sum(filtered_img[int(len_pixels/5)*2:int(len_pixels/5)*3] > 0 )**.5
+    soft_right_score = sum(filtered_img[int(len_pixels/5)*3:int(len_pixels/5)*4] > 0)**.5
+    hard_right_score = sum(filtered_img[-int(len_pixels/5):] > 0)**.5
+
+    return np.array([hard_left_score, soft_left_score, neutral_score, soft_right_score, hard_right_score])
+
+
+def latency_summary(latencies):
+    """
+    Fasst die Latenzen pro Frame (in Sekunden) in Mikrosekunden zusammen.
+    """
+    latencies = np.asarray(latencies)*1e6
+    return dict(mean_us=round(float(latencies.mean()), 1),
+                p50_us=round(float(np.percentile(latencies, 50)), 1),
+                p99_us=round(float(np.percentile(latencies, 99)), 1))
+
+
+def benchmark_score(frames):
+    """
+    Misst die Latenz der Score-Berechnung pro Frame für die ursprüngliche
+    Berechnung pro Farbe und den vektorisierten Kernel und prüft,
+    dass beide exakt die gleichen Scores liefern.
+
+    Parameters
+    ----------
+    frames : list
+        Bereits gefilterte Bilder.
+
+    Returns
+    -------
+    dict
+        Latenzen beider Varianten.
+
+    """
+    cl = CollectorLogik()
+    get_score = cl._CollectorLogik__get_score
+
+    latencies_reference, latencies_vectorized = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        reference = np.stack([reference_score(frame[:,:,channel]) for channel in range(3)], axis=1)
+        latencies_reference.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        vectorized = get_score(frame)
+        latencies_vectorized.append(time.perf_counter() - start)
+
+        assert np.array_equal(reference, vectorized), "Scores weichen von der ursprünglichen Berechnung ab"
+
+    return dict(reference=latency_summary(latencies_reference),
+                vectorized=latency_summary(latencies_vectorized))
+
+
+def benchmark_choose(frames, **collector_kwargs):
+    """
+    Misst die Latenz von CollectorLogik.choose pro Frame.
+
+    Parameters
+    ----------
+    frames : list
+        Kamerabilder.
+    **collector_kwargs :
+        Parameter der CollectorLogik.
+
+    Returns
+    -------
+    dict
+        Latenzen von choose.
+
+    """
+    cl = CollectorLogik(**collector_kwargs)
+
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        cl.choose(frame)
+        latencies.append(time.perf_counter() - start)
+
+    return latency_summary(latencies)
+
+
+def benchmark_ingestion(frames, **collector_kwargs):
+    """
+    Vergleicht die Latenz von CollectorLogik.choose pro Frame für die Eingabe
+    über camera.getImageArray() und über den rohen Puffer von camera.getImage()
+    (inklusive dem Abruf des Bildes von der Kamera) und prüft, dass beide
+    Varianten die gleichen Velocity-Werte liefern.
+
+    Parameters
+    ----------
+    frames : list
+        Kamerabilder.
+    **collector_kwargs :
+        Parameter der CollectorLogik.
+
+    Returns
+    -------
+    dict
+        Latenzen beider Varianten.
+
+    """
+    camera = StubCamera(frames)
+    width, height = camera.getWidth(), camera.getHeight()
+    cl_array = CollectorLogik(**collector_kwargs)
+    cl_buffer = CollectorLogik(**collector_kwargs)
+
+    latencies_array, latencies_buffer = [], []
+    while True:
+        start = time.perf_counter()
+        velocity_array = cl_array.choose(camera.getImageArray())
+        latencies_array.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        velocity_buffer = cl_buffer.choose(camera.getImage(), width, height)
+        latencies_buffer.append(time.perf_counter() - start)
+
+        assert velocity_array == velocity_buffer, "Velocity weicht zwischen getImageArray und getImage ab"
+
+        if not camera.step():
+            break
+
+    return dict(getImageArray=latency_summary(latencies_array),
+                getImage=latency_summary(latencies_buffer))
+
+
+def benchmark_classification(frames, lut_bits=(8, 6, 5)):
+    """
+    Vergleicht die Latenz des Farbfilters pro Frame für den Vergleich der
+    Farbwerte und die Lookup-Tabelle mit verschiedenen Quantisierungen,
+    jeweils auf dem rohen Puffer von camera.getImage().
+    Zusätzlich wird der Anteil der Pixel angegeben, die anders klassifiziert werden.
+
+    Parameters
+    ----------
+    frames : list
+        Kamerabilder.
+    lut_bits : tuple, optional
+        Zu testende Bits pro Farbe der Lookup-Tabelle. The default is (8, 6, 5).
+
+    Returns
+    -------
+    dict
+        Latenzen und Abweichungen der Varianten.
+
+    """
+    camera = StubCamera(frames)
+    width, height = camera.getWidth(), camera.getHeight()
+    buffers = [camera.getImage()]
+    while camera.step():
+        buffers.append(camera.getImage())
+
+    reference_filter = CollectorLogik()._CollectorLogik__ball_filter
+    reference_masks = [reference_filter(buffer, width, height).copy() for buffer in buffers]
+
+    results = {}
+    for classification, bits in [("compare", 8)] + [("lut", bits) for bits in lut_bits]:
+        ball_filter = CollectorLogik(classification=classification, lut_bits=bits)._CollectorLogik__ball_filter
+
+        latencies, n_different = [], 0
+        for buffer, reference_mask in zip(buffers, reference_masks):
+            start = time.perf_counter()
+            filter_mask = ball_filter(buffer, width, height)
+            latencies.append(time.perf_counter() - start)
+            n_different += np.count_nonzero(filter_mask != reference_mask)
+
+        name = classification if classification == "compare" else f"lut_{bits}bit"
+        results[name] = dict(latency_summary(latencies), different_pixels=float(n_different/np.size(reference_masks)))
+
+    return results
+
+
+def resolution_report(bgra_frames, settings=RESOLUTION_SETTINGS, tolerance=0.1, **collector_kwargs):
+    """
+    Vergleicht die Velocity-Werte bei reduzierter Auflösung mit denen bei voller
+    Auflösung auf einer Folge von Bildern (bspw. einer Aufzeichnung des Controllers)
+    und misst die Latenz von choose pro Frame.
+
+    Parameters
+    ----------
+    bgra_frames : np.array
+        Bilder im Format des Puffers von camera.getImage() (Anzahl x Höhe x Breite x BGRA).
+    settings : list, optional
+        Zu vergleichende Parameter stride, downsampling und roi der CollectorLogik.
+    tolerance : float, optional
+        Maximale Abweichung der Velocity, bei der ein Frame als übereinstimmend gilt.
+        The default is 0.1.
+    **collector_kwargs :
+        Weitere Parameter der CollectorLogik.
+
+    Returns
+    -------
+    dict
+        Latenz, mittlere Abweichung der Velocity und Anteil übereinstimmender
+        Frames pro Einstellung.
+
+    """
+    height, width = bgra_frames[0].shape[:2]
+
+    def run(setting):
+        cl = CollectorLogik(**collector_kwargs, **setting)
+        velocities, latencies = [], []
+        for frame in bgra_frames:
+            start = time.perf_counter()
+            velocities.append(cl.choose(frame, width, height))
+            latencies.append(time.perf_counter() - start)
+        return np.array(velocities), latencies
+
+    reference, latencies = run({})
+    report = {"full": dict(latency_summary(latencies), mean_abs_error=0.0, matching_frames=1.0)}
+
+    for setting in settings:
+        velocities, latencies = run(setting)
+        errors = np.abs(velocities - reference).max(axis=1)
+        name = ", ".join(f"{key}={value}" for key, value in setting.items())
+        report[name] = dict(latency_summary(latencies),
+                            mean_abs_error=round(float(errors.mean()), 3),
+                            matching_frames=round(float(np.mean(errors <= tolerance)), 3))
+
+    return report
+
+
+def benchmark_batch(bgra_frames, n_robots=16, **collector_kwargs):
+    """
+    Vergleicht die Latenz pro Simulationsschritt für n_robots einzelne
+    CollectorLogik-Instanzen und eine BatchCollectorLogik und prüft, dass
+    beide die gleichen Velocity-Werte liefern. Jeder Roboter sieht eine
+    versetzte Folge der gegebenen Bilder.
+
+    Parameters
+    ----------
+    bgra_frames : np.array
+        Bilder im Format des Puffers von camera.getImage() (Anzahl x Höhe x Breite x BGRA).
+    n_robots : int, optional
+        Anzahl der Roboter. The default is 16.
+    **collector_kwargs :
+        Parameter der Logik (rewards, sector_weights, ...).
+
+    Returns
+    -------
+    dict
+        Latenzen pro Schritt beider Varianten.
+
+    """
+    height, width = bgra_frames[0].shape[:2]
+    collectors = [CollectorLogik(**collector_kwargs) for _ in range(n_robots)]
+    batch = BatchCollectorLogik(n_robots, **collector_kwargs)
+
+    latencies_single, latencies_batch = [], []
+    for step in range(len(bgra_frames)):
+        # wie bei camera.getImage() erhält jeder Roboter einen Puffer als bytes
+        frames = [bgra_frames[(step + robot) % len(bgra_frames)].tobytes() for robot in range(n_robots)]
+
+        start = time.perf_counter()
+        velocity_single = [cl.choose(frame, width, height) for cl, frame in zip(collectors, frames)]
+        latencies_single.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        velocity_batch = batch.choose(frames, width, height)
+        latencies_batch.append(time.perf_counter() - start)
+
+        assert np.allclose(velocity_single, velocity_batch), "Velocity weicht zwischen Einzel- und Batch-Verarbeitung ab"
+
+    return dict(single=latency_summary(latencies_single),
+                batch=latency_summary(latencies_batch))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latenz-Benchmarks der CollectorLogik")
+    parser.add_argument("--width", type=int, default=52)
+    parser.add_argument("--height", type=int, default=39)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--recording", default=None,
+                        help="Präfix einer Aufzeichnung von recording.FrameRecorder für den Vergleich der Auflösungen.")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frames = [random_frame(args.width, args.height, rng=rng) for _ in range(args.frames)]
+    filtered_frames = [CollectorLogik()._CollectorLogik__ball_filter(frame).copy() for frame in frames]
+
+    for name, result in benchmark_score(filtered_frames).items():
+        print(f"score {name:>12}: {result}")
+    print(f"choose {'':>11}: {benchmark_choose(frames)}")
+    for name, result in benchmark_ingestion(frames).items():
+        print(f"choose {name:>13}: {result}")
+    for name, result in benchmark_classification(frames).items():
+        print(f"filter {name:>13}: {result}")
+
+    if args.recording is not None:
+        bgra_frames = load_frames(args.recording)
+    else:
+        bgra_frames = np.stack([rgb_to_bgra(frame) for frame in frames])
+    for name, result in resolution_report(bgra_frames).items():
+        print(f"resolution {name:>34}: {result}")
+    for name, result in benchmark_batch(bgra_frames).items():
+        print(f"batch {name:>6}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 09:41:12 2026
+
+Prüfungen der Komponenten des Controllers, die ohne Webots ausgeführt
+werden können und bei einer Abweichung mit einem AssertionError abbrechen:
+    python checks.py
+"""
+import json
+import os
+import tempfile
+import msgpack
+from stubs import StubReceiver
+from telemetry import TelemetryPipeline
+
+
+def check_telemetry():
+    """
+    Prüft die Dekodierung von TelemetryPipeline.drain mit einem StubReceiver:
+    Abgeschnittene und fehlerhafte Pakete zählen als Dekodierfehler, ohne die
+    nachfolgenden gültigen Pakete zu verfälschen, Pakete mit mehreren
+    Nachrichten werden vollständig dekodiert und bei voller Queue werden
+    Nachrichten verworfen.
+
+    Returns
+    -------
+    dict
+        Zähler der Pipeline nach der Prüfung.
+
+    """
+    valid = msgpack.packb({"ball": "red"})
+    packets = [msgpack.packb({"ball": "x"*50})[:10],         # abgeschnittener String
+               valid,
+               b"\xc1",                                       # ungültiges Format
+               valid,
+               msgpack.packb(1) + msgpack.packb(2),           # zwei Nachrichten in einem Paket
+               msgpack.packb([1, 2])[:2],                     # abgeschnittene Liste, deren Elemente vollständig sind
+               valid,
+               msgpack.packb(3) + valid[:-1],                 # vollständige Nachricht gefolgt von einem Rest
+               valid]
+    expected = [{"ball": "red"}, {"ball": "red"}, 1, 2, {"ball": "red"}, 3, {"ball": "red"}]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "telemetry.jsonl")
+        pipeline = TelemetryPipeline(path, max_queue=5, flush_interval=0.05)
+        receiver = StubReceiver(packets)
+
+        # der Thread wird erst nach drain gestartet, damit die Queue wirklich voll ist
+        assert pipeline.drain(receiver, 0) == packets
+        pipeline.start()
+        pipeline.stop()
+
+        stats = pipeline.stats()
+        with open(path) as file:
+            written = [json.loads(line) for line in file]
+
+    assert stats["decode_errors"] == 4, stats
+    assert stats["messages_decoded"] == len(expected), stats
+    assert stats["messages_dropped"] == len(expected) - 5, stats
+    assert stats["messages_written"] == 5, stats
+    assert [record["message"] for record in written] == expected[:5], written
+    assert all(record["step"] == 0 for record in written)
+    return stats
+
+
+def main():
+    print(f"telemetry: {check_telemetry()}")
+
+
+if __name__ == "__main__":
+    main()
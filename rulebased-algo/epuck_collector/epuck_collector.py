@@ -3,8 +3,27 @@
 # You may need to import some classes of the controller module. Ex:
 from controller import Robot, Receiver, Motor
 import logging as log
-import msgpack
 from rulebasedAlgo import  CollectorLogik
+from visionPipeline import VisionPipeline
+from recording import FrameRecorder
+from telemetry import TelemetryPipeline
+from instrumentation import LoopProfiler
+
+# Verarbeitet die Bilder in einem eigenen Thread, sodass die Simulation nicht
+# verlangsamt wird, wenn die Verarbeitung länger als ein timestep dauert.
+PIPELINED_VISION = False
+
+# Präfix der Dateien, in denen Bilder, Entscheidungen und Nachrichten
+# aufgezeichnet werden (Wiedergabe mit recording.py), None deaktiviert die Aufzeichnung.
+RECORD_PATH = None
+
+# Datei, in die die empfangenen Nachrichten von einem eigenen Thread geschrieben werden
+TELEMETRY_PATH = "telemetry.jsonl"
+
+# Misst die Dauer der Abschnitte jedes Schritts, loggt Overruns des timesteps
+# und alle PROFILE_INTERVAL Schritte eine Zusammenfassung, None deaktiviert die Messung.
+PROFILE_INTERVAL = 1000
+
 # create the Robot instance.
 robot = Robot()
 
@@ -28,6 +47,8 @@ rec:Receiver = robot.getDevice("receiver")
 rec.enable(timestep)
 camera = robot.getDevice("camera")
 camera.enable(timestep)
+camera_width = camera.getWidth()
+camera_height = camera.getHeight()
 maxVelocity = motorLeft.getMaxVelocity()
 log.basicConfig(level=log.INFO, format='%(asctime)s %(filename)s %(levelname)s: %(message)s')
 
@@ -50,17 +71,62 @@ WORKAROUND:
 """
  
 cl = CollectorLogik()
-      
+
+if PIPELINED_VISION:
+    pipeline = VisionPipeline(cl, camera_width, camera_height)
+    pipeline.start()
+
+if RECORD_PATH is not None:
+    recorder = FrameRecorder(RECORD_PATH, camera_width, camera_height)
+
+telemetry = TelemetryPipeline(TELEMETRY_PATH)
+telemetry.start()
+
+profiler = LoopProfiler(timestep, summary_interval=PROFILE_INTERVAL) if PROFILE_INTERVAL is not None else None
+
+step = 0
 while robot.step(timestep) != -1:
+    step += 1
+    if profiler is not None:
+        profiler.start_step()
     # Process sensor data here.
-    image = camera.getImageArray()
+    # Der rohe BGRA-Puffer wird ohne Umweg über verschachtelte Listen verarbeitet
+    image = camera.getImage()
+    if profiler is not None:
+        profiler.mark("capture")
 
-    v_left, v_right = cl.choose(image)
+    if PIPELINED_VISION:
+        pipeline.submit(image, step)
+        v_left, v_right = pipeline.latest(step)
+        if step % 1000 == 0:
+            log.info(f"Vision-Pipeline: {pipeline.stats()}")
+    else:
+        v_left, v_right = cl.choose(image, camera_width, camera_height, profiler)
     motorRight.setVelocity(v_right)
     motorLeft.setVelocity(v_left)
+    if profiler is not None:
+        profiler.mark("motors")
+        
+    # Nachrichten werden nur dekodiert und in die Queue gelegt, das Schreiben übernimmt ein Thread
+    messages = telemetry.drain(rec, step)
+    if step % 1000 == 0:
+        log.info(f"Telemetrie: {telemetry.stats()}")
+    if profiler is not None:
+        profiler.mark("receiver")
+        profiler.end_step(step)
         
-    while rec.getQueueLength() > 0:
-        msg_dat = rec.getData()
-        rec.nextPacket()
-        msg = msgpack.unpackb(msg_dat)
-        log.info(msg)
+    if RECORD_PATH is not None:
+        # mit PIPELINED_VISION stammt die Entscheidung von einem älteren Bild
+        decision_step = step
+        if PIPELINED_VISION:
+            decision_step = -1 if pipeline.latest_decision_step is None else pipeline.latest_decision_step
+        recorder.record(step, image, (v_left, v_right), messages, decision_step)
+
+telemetry.stop()
+
+if profiler is not None:
+    # noch nicht gemeldete Overruns der letzten Sekunden
+    profiler.warn_overruns()
+
+if RECORD_PATH is not None:
+    recorder.close()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 16:21:05 2026
+
+Zeitmessung der Abschnitte der Steuerschleife des Controllers.
+"""
+import bisect
+import logging as log
+import time
+
+
+# Obere Grenzen der Buckets in Millisekunden, der letzte Bucket nimmt alle größeren Werte auf
+BUCKET_BOUNDS_MS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Abschnitte eines Simulationsschritts in der Reihenfolge ihrer Ausführung
+STAGES = ("capture", "ball_filter", "choose_action", "action_to_velocity", "motors", "receiver")
+
+
+class LatencyHistogram:
+
+    def __init__(self, bounds_ms=BUCKET_BOUNDS_MS):
+        """
+        Histogramm mit festen Buckets, in das Latenzen ohne Allokation
+        eingetragen werden. Perzentile werden über die obere Grenze
+        des jeweiligen Buckets abgeschätzt.
+
+        Parameters
+        ----------
+        bounds_ms : tuple, optional
+            Aufsteigende obere Grenzen der Buckets in Millisekunden.
+            The default is BUCKET_BOUNDS_MS.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.bounds_ms = bounds_ms
+        self.counts = [0]*(len(bounds_ms) + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms):
+        """
+        Trägt eine Latenz in Millisekunden ein.
+        """
+        self.counts[bisect.bisect_left(self.bounds_ms, latency_ms)] += 1
+        self.n += 1
+        self.total_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, q):
+        """
+        Obere Grenze des Buckets, in dem das q-te Perzentil liegt.
+        Für den letzten Bucket wird das Maximum zurückgegeben.
+        """
+        if self.n == 0:
+            return None
+        rank = q/100*self.n
+        cumulative = 0
+        for bound, count in zip(self.bounds_ms, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def summary(self):
+        """
+        Kennzahlen des Histogramms in Millisekunden.
+        """
+        if self.n == 0:
+            return dict(n=0)
+        return dict(n=self.n,
+                    mean_ms=round(self.total_ms/self.n, 3),
+                    p50_ms=self.percentile(50),
+                    p99_ms=self.percentile(99),
+                    max_ms=round(self.max_ms, 3))
+
+    def reset(self):
+        self.counts = [0]*(len(self.bounds_ms) + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+class LoopProfiler:
+
+    def __init__(self, timestep, stages=STAGES, summary_interval=1000, overrun_interval=5.0, logger=log):
+        """
+        Misst die Dauer der Abschnitte jedes Simulationsschritts mit
+        time.perf_counter und trägt sie in Histogramme ein. Dauert ein Schritt
+        länger als der timestep der Simulation, zählt er als Overrun. Overruns
+        werden höchstens alle overrun_interval Sekunden gemeinsam geloggt, mit
+        ihrer Anzahl und den Abschnitten des längsten Schritts.
+        Alle summary_interval Schritte wird eine Zusammenfassung geloggt und
+        die Histogramme werden zurückgesetzt.
+
+        Die Abschnitte werden über mark beendet, wobei jeweils die Zeit seit
+        dem vorherigen mark bzw. start_step gemessen wird. Die Abschnitte
+        ball_filter, choose_action und action_to_velocity werden von
+        CollectorLogik.choose markiert, wenn der Profiler übergeben wird.
+
+        Parameters
+        ----------
+        timestep : int
+            Timestep der Simulation in Millisekunden.
+        stages : tuple, optional
+            Namen der Abschnitte. The default is STAGES.
+        summary_interval : int, optional
+            Anzahl der Schritte zwischen zwei Zusammenfassungen,
+            None deaktiviert diese. The default is 1000.
+        overrun_interval : float, optional
+            Minimaler Abstand in Sekunden zwischen zwei Meldungen von Overruns.
+            The default is 5.0.
+        logger : optional
+            Logger für Overruns und Zusammenfassungen. The default is logging.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.timestep = timestep
+        self.summary_interval = summary_interval
+        self.logger = logger
+
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.step_histogram = LatencyHistogram()
+        self.n_steps = 0
+        self.n_overruns = 0
+        self.overruns_since_summary = 0
+
+        # Overruns seit der letzten Meldung und der längste davon (Schritt, Dauer, Abschnitte)
+        self.overrun_interval = overrun_interval
+        self.overruns_since_warning = 0
+        self.worst_overrun = None
+        self.last_warning = None
+
+        self.step_start = None
+        self.last_mark = None
+        self.current_stages = {}
+
+    def start_step(self):
+        """
+        Beginnt die Messung eines Simulationsschritts.
+        """
+        self.step_start = self.last_mark = time.perf_counter()
+        self.current_stages.clear()
+
+    def mark(self, stage):
+        """
+        Beendet einen Abschnitt und trägt seine Dauer ein.
+        """
+        now = time.perf_counter()
+        latency_ms = (now - self.last_mark)*1e3
+        self.histograms[stage].record(latency_ms)
+        self.current_stages[stage] = latency_ms
+        self.last_mark = now
+
+    def end_step(self, step):
+        """
+        Beendet die Messung eines Simulationsschritts und loggt in
+        regelmäßigen Abständen die Overruns sowie eine Zusammenfassung.
+
+        Parameters
+        ----------
+        step : int
+            Nummer des Simulationsschritts.
+
+        Returns
+        -------
+        step_ms : float
+            Dauer des Schritts in Millisekunden.
+
+        """
+        now = time.perf_counter()
+        step_ms = (now - self.step_start)*1e3
+        self.step_histogram.record(step_ms)
+        self.n_steps += 1
+
+        if step_ms > self.timestep:
+            self.n_overruns += 1
+            self.overruns_since_summary += 1
+            self.overruns_since_warning += 1
+            if self.worst_overrun is None or step_ms > self.worst_overrun[1]:
+                self.worst_overrun = (step, step_ms, dict(self.current_stages))
+
+        if self.overruns_since_warning and (self.last_warning is None or now - self.last_warning >= self.overrun_interval):
+            self.warn_overruns()
+            self.last_warning = now
+
+        if self.summary_interval is not None and self.n_steps % self.summary_interval == 0:
+            self.logger.info(f"Latenz der Steuerschleife: {self.summary()}")
+            self.reset()
+
+        return step_ms
+
+    def warn_overruns(self):
+        """
+        Loggt die Overruns seit der letzten Meldung mit den Abschnitten des längsten Schritts.
+        """
+        if not self.overruns_since_warning:
+            return
+        step, step_ms, stages = self.worst_overrun
+        stages = ", ".join(f"{stage}={latency_ms:.3f}" for stage, latency_ms in stages.items())
+        self.logger.warning(f"{self.overruns_since_warning} Overruns > {self.timestep} ms, "
+                            f"längster in Schritt {step}: {step_ms:.3f} ms ({stages})")
+        self.overruns_since_warning = 0
+        self.worst_overrun = None
+
+    def summary(self):
+        """
+        Kennzahlen der Histogramme seit der letzten Zusammenfassung.
+
+        Returns
+        -------
+        dict
+            Kennzahlen pro Abschnitt und für den gesamten Schritt, Anteil
+            des timesteps im Mittel sowie Anzahl der Overruns.
+
+        """
+        step = self.step_histogram.summary()
+        budget = round(step["mean_ms"]/self.timestep, 3) if step["n"] else None
+        return dict(step=step, budget_used=budget, overruns=self.overruns_since_summary,
+                    total_overruns=self.n_overruns,
+                    **{stage: histogram.summary() for stage, histogram in self.histograms.items()})
+
+    def reset(self):
+        """
+        Setzt die Histogramme für den nächsten Zeitraum zurück.
+        """
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.step_histogram.reset()
+        self.overruns_since_summary = 0
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 15:30:11 2026
+
+Aufzeichnung der Kamerabilder, Entscheidungen und Nachrichten des Controllers
+und Wiedergabe der Bilder durch die CollectorLogik ohne Webots:
+    python recording.py aufzeichnung
+"""
+import argparse
+import glob
+import queue
+import threading
+import time
+import numpy as np
+from rulebasedAlgo import CollectorLogik
+
+
+class FrameRecorder:
+
+    def __init__(self, path, width, height, chunk_size=1000, max_pending=2):
+        """
+        Zeichnet pro Simulationsschritt das Kamerabild, die daraus bestimmten
+        Velocity-Werte und die empfangenen Nachrichten auf. Die Daten werden
+        in Blöcken von chunk_size Schritten als komprimierte npz-Dateien
+        <path>_00000.npz, <path>_00001.npz, ... gespeichert.
+        
+        Das Komprimieren und Schreiben eines Blocks dauert deutlich länger als
+        ein timestep und übernimmt daher ein eigener Thread. Die Steuerschleife
+        wartet nur, wenn bereits max_pending Blöcke auf das Schreiben warten.
+
+        Parameters
+        ----------
+        path : str
+            Präfix der Dateien.
+        width : int
+            Breite der Bilder (camera.getWidth()).
+        height : int
+            Höhe der Bilder (camera.getHeight()).
+        chunk_size : int, optional
+            Anzahl der Schritte pro Datei. The default is 1000.
+        max_pending : int, optional
+            Maximale Anzahl der Blöcke, die auf das Schreiben warten.
+            The default is 2.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.n_chunks = 0
+
+        self.__new_chunk()
+
+        # Blöcke, die vom Thread geschrieben werden, None beendet den Thread
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.thread = threading.Thread(target=self.__write, name="frame-recorder", daemon=True)
+        self.thread.start()
+
+    def __new_chunk(self):
+        """
+        Legt die Puffer eines neuen Blocks an, die Bilder im Format von camera.getImage().
+        Die Puffer des vorherigen Blocks gehören danach dem schreibenden Thread.
+        """
+        self.frames = np.empty((self.chunk_size, self.height, self.width, 4), dtype=np.uint8)
+        self.decisions = np.empty((self.chunk_size, 2))
+        self.steps = np.empty(self.chunk_size, dtype=np.int64)
+        self.decision_steps = np.empty(self.chunk_size, dtype=np.int64)
+        self.n_frames = 0
+
+        # Die rohen Nachrichten werden aneinandergehängt und über Offsets getrennt
+        self.message_data = bytearray()
+        self.message_offsets = []
+        self.message_steps = []
+
+    def record(self, step, image, velocity, messages=(), decision_step=None):
+        """
+        Zeichnet einen Simulationsschritt auf.
+
+        Parameters
+        ----------
+        step : int
+            Nummer des Simulationsschritts.
+        image : bytes
+            Ausgabe der Funktion camera.getImage().
+        velocity : tuple
+            Von CollectorLogik.choose bestimmte Velocity-Werte (v_left, v_right).
+        messages : list, optional
+            Rohe Nachrichten des Receivers (receiver.getData()) in diesem Schritt.
+        decision_step : int, optional
+            Schritt, in dem das Bild aufgenommen wurde, aus dem velocity
+            bestimmt wurde (VisionPipeline.latest_decision_step), -1 wenn noch
+            keine Entscheidung vorlag. The default is None, also step.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.frames[self.n_frames] = np.frombuffer(image, dtype=np.uint8).reshape(self.height, self.width, 4)
+        self.decisions[self.n_frames] = velocity
+        self.steps[self.n_frames] = step
+        self.decision_steps[self.n_frames] = step if decision_step is None else decision_step
+        self.n_frames += 1
+
+        for message in messages:
+            self.message_offsets.append(len(self.message_data))
+            self.message_steps.append(step)
+            self.message_data += message
+
+        if self.n_frames == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Übergibt den aktuellen Block an den schreibenden Thread, sofern er Schritte enthält.
+        """
+        if self.n_frames == 0:
+            return
+
+        chunk = dict(frames=self.frames[:self.n_frames],
+                     decisions=self.decisions[:self.n_frames],
+                     steps=self.steps[:self.n_frames],
+                     decision_steps=self.decision_steps[:self.n_frames],
+                     message_data=np.frombuffer(bytes(self.message_data), dtype=np.uint8),
+                     message_offsets=np.array(self.message_offsets, dtype=np.int64),
+                     message_steps=np.array(self.message_steps, dtype=np.int64))
+        self.pending.put((f"{self.path}_{self.n_chunks:05d}.npz", chunk))
+
+        self.n_chunks += 1
+        self.__new_chunk()
+
+    def close(self):
+        """
+        Speichert die verbliebenen Schritte und wartet, bis alle Blöcke geschrieben wurden.
+        """
+        self.flush()
+        self.pending.put(None)
+        self.thread.join()
+
+    def __write(self):
+        """
+        Schleife des Threads: Komprimiert und speichert die übergebenen Blöcke.
+        """
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            file, chunk = item
+            np.savez_compressed(file, **chunk)
+
+
+def iter_chunks(path):
+    """
+    Liest die Blöcke einer Aufzeichnung nacheinander ein.
+
+    Parameters
+    ----------
+    path : str
+        Präfix der Dateien, wie bei FrameRecorder.
+
+    Yields
+    ------
+    dict
+        Arrays eines Blocks (frames, decisions, steps, decision_steps,
+        message_data, message_offsets, message_steps).
+
+    """
+    for file in sorted(glob.glob(f"{glob.escape(path)}_[0-9][0-9][0-9][0-9][0-9].npz")):
+        with np.load(file) as chunk:
+            yield {key: chunk[key] for key in chunk.files}
+
+
+def load_frames(path):
+    """
+    Lädt alle Bilder einer Aufzeichnung (Anzahl x Höhe x Breite x BGRA).
+    """
+    return np.concatenate([chunk["frames"] for chunk in iter_chunks(path)])
+
+
+def chunk_messages(chunk):
+    """
+    Trennt die rohen Nachrichten eines Blocks.
+
+    Returns
+    -------
+    list
+        Tupel (step, message) mit den Nachrichten als bytes.
+
+    """
+    data = chunk["message_data"].tobytes()
+    ends = list(chunk["message_offsets"][1:]) + [len(data)]
+    return [(int(step), data[start:end])
+            for step, start, end in zip(chunk["message_steps"], chunk["message_offsets"], ends)]
+
+
+def replay(path, tolerance=1e-9, **collector_kwargs):
+    """
+    Verarbeitet alle Bilder einer Aufzeichnung so schnell wie möglich durch
+    CollectorLogik.choose und vergleicht die Ergebnisse mit den aufgezeichneten
+    Entscheidungen. Die Aufzeichnung muss mit dem ersten Schritt des Controllers
+    beginnen, da die Entscheidungen von den vorherigen Bildern abhängen.
+    Bei Aufzeichnungen mit PIPELINED_VISION stammen die Entscheidungen von
+    älteren Bildern und hängen von den verworfenen Bildern ab, daher wird
+    dann nur die Latenz gemessen und divergences ist None.
+
+    Parameters
+    ----------
+    path : str
+        Präfix der Dateien, wie bei FrameRecorder.
+    tolerance : float, optional
+        Maximale Abweichung der Velocity, bevor ein Frame als abweichend gilt.
+        The default is 1e-9.
+    **collector_kwargs :
+        Parameter der CollectorLogik.
+
+    Returns
+    -------
+    dict
+        Anzahl der Frames, Frames pro Sekunde, Perzentile der Latenz in
+        Millisekunden und die abweichenden Schritte.
+
+    """
+    cl = CollectorLogik(**collector_kwargs)
+
+    latencies, divergent_steps, is_pipelined = [], [], False
+    for chunk in iter_chunks(path):
+        height, width = chunk["frames"].shape[1:3]
+        # ältere Aufzeichnungen enthalten keine decision_steps
+        if "decision_steps" in chunk:
+            is_pipelined |= bool((chunk["decision_steps"] != chunk["steps"]).any())
+        for frame, decision, step in zip(chunk["frames"], chunk["decisions"], chunk["steps"]):
+            start = time.perf_counter()
+            velocity = cl.choose(frame, width, height)
+            latencies.append(time.perf_counter() - start)
+
+            if np.abs(np.array(velocity) - decision).max() > tolerance:
+                divergent_steps.append(int(step))
+
+    if is_pipelined:
+        divergent_steps = None
+
+    latencies = np.array(latencies)*1e3
+    return dict(frames=len(latencies),
+                fps=round(float(len(latencies)/latencies.sum()*1e3), 1),
+                p50_ms=round(float(np.percentile(latencies, 50)), 3),
+                p90_ms=round(float(np.percentile(latencies, 90)), 3),
+                p99_ms=round(float(np.percentile(latencies, 99)), 3),
+                max_ms=round(float(latencies.max()), 3),
+                divergences=None if is_pipelined else len(divergent_steps),
+                divergent_steps=None if is_pipelined else divergent_steps[:20])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wiedergabe einer Aufzeichnung durch die CollectorLogik")
+    parser.add_argument("path", help="Präfix der Dateien der Aufzeichnung")
+    parser.add_argument("--tolerance", type=float, default=1e-9)
+    parser.add_argument("--classification", default="compare")
+    args = parser.parse_args(argv)
+
+    result = replay(args.path, args.tolerance, classification=args.classification)
+    for key, value in result.items():
+        print(f"{key:>16}: {value}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
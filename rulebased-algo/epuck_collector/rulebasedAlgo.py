@@ -4,14 +4,96 @@ Created on Fri Jul  2 22:25:22 2021
 
 @author: Bjarne Gerdes
 """
+from functools import lru_cache
 import numpy as np
 
+
+@lru_cache(maxsize=None)
+def sector_indices(image_shape):
+    """
+    Berechnet die Grenzen der 5 Sektoren für ein Bild der gegebenen Größe.
+    Da sich die Größe des Kamerabildes nicht ändert, wird das Ergebnis
+    pro Bildgröße zwischengespeichert.
+    
+    Die Grenzen entsprechen exakt den Slices auf dem flachgedrückten Bild:
+        [:n/5], [n/5:2n/5], [2n/5:3n/5], [3n/5:4n/5], [-n/5:]
+    Sie werden so angeordnet, dass np.add.reduceat an den geraden Positionen
+    die Summen der Sektoren liefert (die ungeraden Positionen sind zu ignorieren).
+
+    Parameters
+    ----------
+    image_shape : tuple
+        Breite und Höhe des Bildes.
+
+    Returns
+    -------
+    np.array
+        Indizes für np.add.reduceat.
+
+    """
+    len_pixels = image_shape[0]*image_shape[1]
+    sector_len = int(len_pixels/5)
+    
+    return np.array([0, sector_len,
+                     sector_len, sector_len*2,
+                     sector_len*2, sector_len*3,
+                     sector_len*3, sector_len*4,
+                     len_pixels - sector_len])
+
+
+# Maske der Farben für jede Klasse der Lookup-Tabelle (keine, rot, grün, blau)
+CLASS_MASKS = np.array([[False, False, False],
+                        [True, False, False],
+                        [False, True, False],
+                        [False, False, True]])
+
+
+@lru_cache(maxsize=None)
+def class_lookup_table(bits):
+    """
+    Erstellt eine Lookup-Tabelle, die jedem quantisierten RGB-Wert die Klasse
+    0 (kein Ball), 1 (roter Ball), 2 (grüner Ball) oder 3 (blauer Ball) zuordnet.
+    Die Klasse wird mit der gleichen Regel wie in __ball_filter bestimmt:
+    Ein Farbwert muss doppelt so groß sein, wie die der beiden anderen Farben.
+    
+    Der Index eines Pixels ist (r << 2*bits) | (g << bits) | b, wobei r, g und b
+    auf bits Bits quantisiert sind. Bei bits=8 entspricht die Tabelle exakt
+    dem Vergleich, bei weniger Bits wird die Mitte jedes Intervalls klassifiziert.
+
+    Parameters
+    ----------
+    bits : int
+        Anzahl der Bits pro Farbe (1 bis 8).
+
+    Returns
+    -------
+    np.array
+        Tabelle mit 2**(3*bits) Einträgen vom Typ uint8.
+
+    """
+    shift = 8 - bits
+    values = (np.arange(2**bits, dtype=np.int16) << shift) + ((1 << shift) >> 1)
+    red, green, blue = values[:,None,None], values[None,:,None], values[None,None,:]
+    
+    # Die Klassen schließen sich gegenseitig aus. Die Tabelle wird direkt als uint8
+    # befüllt, damit bei 8 Bits keine int64-Zwischenergebnisse mit 2**24 Einträgen entstehen
+    table = np.zeros((2**bits,)*3, dtype=np.uint8)
+    table[(green*2 < red) & (blue*2 < red)] = 1
+    table[(red*2 < green) & (blue*2 < green)] = 2
+    table[(red*2 < blue) & (green*2 < blue)] = 3
+    
+    return table.ravel()
+
+
 class CollectorLogik:   
     
     def __init__(self, rewards=[1,-1.5,2.5],
                 sector_weights= [2,1,4,-1,-1],
                 sensitivity_factor = 3,
-                min_velocity = 2, min_action = 2):
+                min_velocity = 2, min_action = 2,
+                classification = "compare", lut_bits = 8,
+                stride = 1, downsampling = "stride", roi = None,
+                smoothing = "mean", smoothing_window = 5, ema_alpha = 0.4):
         """
         Bei dieses Klasse handelt es sich um die Logik des regelbasierten Algorithmus.
         Demnach werden hier die Bilder erzeugt durch die Umgebung verarbeitet und daraus
@@ -76,26 +158,115 @@ class CollectorLogik:
             sich dreht, wenn kein Ball sichtbar ist.            
             
             The default is 2.
+            
+        classification : str, optional
+            Bestimmt wie die Pixel den Bällen zugeordnet werden:
+            * "compare": Vergleich der Farbwerte jedes Pixels.
+            * "lut": Nachschlagen der Klasse jedes Pixels in einer
+              einmalig erstellten Tabelle (siehe class_lookup_table).
+            The default is "compare".
+            
+        lut_bits : int, optional
+            Anzahl der Bits pro Farbe der Lookup-Tabelle. Bei 8 Bits ist das
+            Ergebnis identisch zu "compare", die Tabelle ist aber 16 MB groß.
+            Weniger Bits verkleinern die Tabelle auf Kosten der Genauigkeit.
+            The default is 8.
+            
+        stride : int, optional
+            Reduziert die Auflösung in beiden Richtungen um diesen Faktor.
+            Die Anzahl der Pixel pro Sektor wird vor dem Ziehen der Wurzel mit
+            stride**2 multipliziert, sodass die Scores vergleichbar bleiben und
+            rewards, sector_weights und min_action weiterhin passen.
+            The default is 1.
+            
+        downsampling : str, optional
+            Bestimmt wie die Auflösung reduziert wird:
+            * "stride": Nur jeder stride-te Pixel wird betrachtet (ohne Kopie).
+            * "block": Mittelwert (abgerundet) jedes Blocks aus stride x stride Pixeln.
+            The default is "stride".
+            
+        roi : tuple, optional
+            Bereich (Anfang, Ende) der Bildhöhe als Anteil zwischen 0 und 1,
+            der verarbeitet wird. Bspw. (0.5, 1) für die untere Bildhälfte,
+            in der die Bälle auf dem Boden zu sehen sind.
+            The default is None, also das gesamte Bild.
+            
+        smoothing : str, optional
+            Bestimmt wie die Velocity-Werte über die Zeit geglättet werden:
+            * "mean": Mittelwert der letzten smoothing_window Werte.
+            * "ema": Exponentielle Glättung mit dem Faktor ema_alpha.
+            Beide benötigen unabhängig von der Laufzeit konstanten Speicher.
+            The default is "mean".
+            
+        smoothing_window : int, optional
+            Anzahl der Werte, über die bei smoothing = "mean" gemittelt wird,
+            mindestens 1. The default is 5.
+            
+        ema_alpha : float, optional
+            Gewicht des neuesten Werts bei smoothing = "ema".
+            The default is 0.4.
 
         Returns
         -------
         None.
 
         """
+        if smoothing_window < 1:
+            raise ValueError(f"smoothing_window muss mindestens 1 sein, nicht {smoothing_window}")
         
         self.rewards = rewards
-        self.velocity_left_long_term = []
-        self.velocity_right_long_term = []
         self.sector_weights = sector_weights
+        self.sector_weights_right = np.array(sector_weights)
+        self.sector_weights_left = np.array(sector_weights[::-1])
         self.sensitivity_factor = sensitivity_factor
         self.min_velocity = min_velocity
         self.min_action = min_action
         
+        # Vorallokierte Speicher für den Farbfilter, pro Bildgröße
+        self.__buffers = {}
+        
+        self.classification = classification
+        self.lut_bits = lut_bits
+        if classification == "lut":
+            self.class_lut = class_lookup_table(lut_bits)
+        
+        self.stride = stride
+        self.downsampling = downsampling
+        self.roi = roi
+        self.pixel_scale = stride**2
+        
+        self.smoothing = smoothing
+        self.smoothing_window = smoothing_window
+        self.ema_alpha = ema_alpha
+        self.reset()
+        
+    def reset(self):
+        """
+        Setzt das Kurzzeitgedächtnis der Velocity-Werte zurück,
+        bspw. zu Beginn einer neuen Episode.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Ringpuffer der "unsauberen" Velocity-Werte mit laufender Summe
+        self.velocity_left_long_term = [0.0]*self.smoothing_window
+        self.velocity_right_long_term = [0.0]*self.smoothing_window
+        self.velocity_left_sum = 0.0
+        self.velocity_right_sum = 0.0
+        self.velocity_position = 0
+        self.velocity_count = 0
+        
+        # Zustand der exponentiellen Glättung
+        self.velocity_left_ema = None
+        self.velocity_right_ema = None
+        
     def __get_score(self, image):
         """
-        Als Eingabewert nimmt diese Funktion das Bild mit jeweils lediglich einem Farbwert.
+        Als Eingabewert nimmt diese Funktion das Bild mit allen drei gefilterten Farbwerten.
         Anschließend wird das Bild in 5 Sektoren, von links nach rechts, unterteilt und jeweils
-        die Anzahl der Pixel ermittelt die nach dem Filter verblieben sind.
+        die Anzahl der Pixel pro Farbe ermittelt die nach dem Filter verblieben sind.
         Üblicherweise funktioniert die Filterlogik sehr gut, wodurch dieser Wert als äquivalent 
         zu verstehen ist zum Kreisvolumen.
         
@@ -103,29 +274,27 @@ class CollectorLogik:
         des Roboters zu diesem verhält, ist der Score entsprechend mit der Wurzel neutralisiert 
         worden, den Abstand zum Kreis linear zu halten 
         
+        Die Pixel aller Sektoren und Farben werden in einer einzigen Reduktion gezählt.
+        
         Parameters
         ----------
         image : np.array
-            Farbwerte einer einzellnen Farbe pro
-            Pixel im Bild.
+            Gefiltertes Bild mit allen Farbräumen bzw. die Maske
+            der Funktion __ball_filter.
 
         Returns
         -------
         np.array
-            Numpy array mit den Scores pro Sektor.
+            Numpy array mit den Scores pro Sektor (Zeilen) und Farbe (Spalten).
 
         """
         # Bild in 5 verschiedene Sektoren aufteilen und anhand dessen für jeden dieser
-        # Sektoren einen "Score" berechnen
-        filtered_img = image.flatten()
-        len_pixels = len(filtered_img)
-        hard_left_score = sum(filtered_img[:int(len_pixels/5)] > 0)**.5
-        soft_left_score = sum(filtered_img[int(len_pixels/5):int(len_pixels/5)*2] > 0 )**.5
-        neutral_score = sum(filtered_img[int(len_pixels/5)*2:int(len_pixels/5)*3] > 0 )**.5
-        soft_right_score = sum(filtered_img[int(len_pixels/5)*3:int(len_pixels/5)*4] > 0)**.5
-        hard_right_score = sum(filtered_img[-int(len_pixels/5):] > 0)**.5
-        
-        return np.array([hard_left_score, soft_left_score, neutral_score, soft_right_score, hard_right_score])
+        # Sektoren und jede Farbe einen "Score" berechnen
+        filtered_pixels = (image > 0).reshape(-1, 3)
+        pixel_counts = np.add.reduceat(filtered_pixels, sector_indices(image.shape[:2]), axis=0, dtype=np.int64)
+        
+        # Bei reduzierter Auflösung steht jeder Pixel für stride**2 Pixel des Bildes
+        return (pixel_counts[::2]*self.pixel_scale)**.5
          
      
     def __choose_action(self, image):
@@ -146,48 +315,244 @@ class CollectorLogik:
             Vektor mit Reward pro Sektor.
 
         """
-        red_score = self.__get_score(image[:,:,0])
-        green_score = self.__get_score(image[:,:,1])
-        blue_score = self.__get_score(image[:,:,2])
+        score = self.__get_score(image)
+        red_score = score[:,0]
+        green_score = score[:,1]
+        blue_score = score[:,2]
         
      
         return (red_score*self.rewards[0] + green_score*self.rewards[1] + blue_score*self.rewards[2])
         
     
-    def __ball_filter(self, image):
+    def __frame_view(self, image, width, height):
+        """
+        Interpretiert den rohen BGRA-Puffer von camera.getImage() ohne
+        ihn zu kopieren als Bild im Format von camera.getImageArray(),
+        also Breite x Höhe x RGB.
+
+        Parameters
+        ----------
+        image : bytes
+            Ausgabe der Funktion camera.getImage() des Roboters.
+        width : int
+            Breite des Bildes (camera.getWidth()).
+        height : int
+            Höhe des Bildes (camera.getHeight()).
+
+        Returns
+        -------
+        np.array
+            View auf den Puffer mit den Dimensionen (width, height, 3).
+
+        """
+        bgra = np.frombuffer(image, dtype=np.uint8).reshape(height, width, 4)
+        
+        # Transponieren und Umsortieren von BGR zu RGB erzeugen lediglich neue Views
+        return bgra.transpose(1, 0, 2)[:,:,2::-1]
+    
+    def __roi_rows(self, height):
+        """
+        Zeilen des Bildes, die unter Berücksichtigung von roi
+        und stride verarbeitet werden.
+        """
+        if self.roi is None:
+            return slice(0, height, self.stride)
+        return slice(int(round(self.roi[0]*height)), int(round(self.roi[1]*height)), self.stride)
+    
+    def __reduce_resolution(self, img_array):
+        """
+        Reduziert die Auflösung des Bildes (Breite x Höhe x RGB) entsprechend
+        roi, stride und downsampling. Bei downsampling = "stride" werden
+        lediglich Views erzeugt.
+
+        Parameters
+        ----------
+        img_array : np.array
+            Bild im Format von camera.getImageArray().
+
+        Returns
+        -------
+        np.array
+            Bild mit reduzierter Auflösung.
+
+        """
+        if self.roi is None and self.stride == 1:
+            return img_array
+        
+        if self.downsampling == "block" and self.stride > 1:
+            rows = self.__roi_rows(img_array.shape[1])
+            img_array = img_array[:, rows.start:rows.stop]
+            
+            # Bild auf ein Vielfaches von stride zuschneiden und die Blöcke mitteln
+            width, height = (img_array.shape[0]//self.stride), (img_array.shape[1]//self.stride)
+            blocks = img_array[:width*self.stride, :height*self.stride].reshape(width, self.stride, height, self.stride, 3)
+            return blocks.sum(axis=(1, 3), dtype=np.int32)//self.pixel_scale
+        
+        return img_array[::self.stride, self.__roi_rows(img_array.shape[1])]
+        
+    def __get_buffers(self, image_shape):
+        """
+        Liefert die vorallokierten Speicher des Farbfilters für
+        die gegebene Bildgröße und legt diese beim ersten Aufruf an.
+        """
+        if image_shape not in self.__buffers:
+            self.__buffers[image_shape] = (np.empty(image_shape + (3,), dtype=np.int16),
+                                           np.empty(image_shape + (3,), dtype=bool),
+                                           np.empty(image_shape, dtype=bool))
+        return self.__buffers[image_shape]
+    
+    def __lut_filter(self, image, width=None, height=None):
+        """
+        Umsetzen der Filterlogik aus __ball_filter mit der Lookup-Tabelle:
+        Aus den Farbwerten jedes Pixels wird ein Index berechnet und die Klasse
+        des Pixels mit einem einzigen Zugriff auf die Tabelle bestimmt.
+        
+        Für den rohen BGRA-Puffer mit 8 Bits ist der Index lediglich
+        der als uint32 gelesene Pixel ohne den Alpha-Kanal.
+
+        Parameters
+        ----------
+        Siehe __ball_filter.
+
+        Returns
+        -------
+        filter_mask : np.array
+            Siehe __ball_filter.
+
+        """
+        bits = self.lut_bits
+        shift = 8 - bits
+        
+        if width is not None and height is not None and not (self.downsampling == "block" and self.stride > 1):
+            pixels = np.frombuffer(image, dtype="<u4").reshape(height, width)
+            pixels = pixels[self.__roi_rows(height), ::self.stride]
+            is_buffer = True
+            index, classes, filter_mask = self.__get_lut_buffers(pixels.shape, is_buffer)
+            
+            if bits == 8:
+                np.bitwise_and(pixels, 0xFFFFFF, out=index)
+            else:
+                # B liegt in den Bits 0-7, G in 8-15 und R in 16-23
+                mask = (1 << bits) - 1
+                np.bitwise_or(((pixels >> (16 + shift)) & mask) << (2*bits),
+                              ((pixels >> (8 + shift)) & mask) << bits, out=index)
+                np.bitwise_or(index, (pixels >> shift) & mask, out=index)
+        else:
+            if width is not None and height is not None:
+                img_array = self.__frame_view(image, width, height)
+            else:
+                img_array = np.array(image, dtype=np.int16)
+            img_array = self.__reduce_resolution(img_array).astype(np.uint32)
+            is_buffer = False
+            index, classes, filter_mask = self.__get_lut_buffers(img_array.shape[:2], is_buffer)
+            
+            np.bitwise_or((img_array[:,:,0] >> shift) << (2*bits), (img_array[:,:,1] >> shift) << bits, out=index)
+            np.bitwise_or(index, img_array[:,:,2] >> shift, out=index)
+        
+        np.take(self.class_lut, index, out=classes)
+        
+        # Der Puffer ist Höhe x Breite, die Maske wie bei getImageArray() Breite x Höhe
+        if is_buffer:
+            classes = classes.T
+        np.take(CLASS_MASKS, classes, axis=0, out=filter_mask)
+        
+        return filter_mask
+    
+    def __get_lut_buffers(self, index_shape, is_buffer):
+        """
+        Liefert die vorallokierten Speicher für __lut_filter, siehe __get_buffers.
+        Beim rohen Puffer ist der Index Höhe x Breite, die Maske aber Breite x Höhe.
+        """
+        key = ("lut", index_shape, is_buffer)
+        if key not in self.__buffers:
+            mask_shape = index_shape[::-1] if is_buffer else index_shape
+            self.__buffers[key] = (np.empty(index_shape, dtype=np.uint32),
+                                   np.empty(index_shape, dtype=np.uint8),
+                                   np.empty(mask_shape + (3,), dtype=bool))
+        return self.__buffers[key]
+    
+    def __ball_filter(self, image, width=None, height=None):
         """
         Umsetzen der Filterlogik, die dazu führt,
         dass lediglich jene Pixel erhalten beleiben,
         die zu einem Ball gehören.
+        
+        Das Ergebnis wird in vorallokierte Speicher geschrieben und
+        ist somit nur bis zum nächsten Aufruf gültig.
 
         Parameters
         ----------
         image :
             Ausgabe der Funktion camera.getImageArray()
-            des Roboters.
+            oder camera.getImage() des Roboters.
+        width : int, optional
+            Breite des Bildes, nur notwendig für camera.getImage().
+        height : int, optional
+            Höhe des Bildes, nur notwendig für camera.getImage().
 
         Returns
         -------
-        img_array : np.array
-            Gefiltertes Bild als np.array.
+        filter_mask : np.array
+            Maske mit den Dimensionen Breite x Höhe x RGB, die für
+            jede Farbe angibt, ob der Pixel zu einem Ball dieser Farbe gehört.
 
         """
-        img_array = np.array(image)
+        if self.classification == "lut":
+            return self.__lut_filter(image, width, height)
+        
+        if width is not None and height is not None:
+            img_array = self.__frame_view(image, width, height)
+        else:
+            img_array = np.array(image, dtype=np.int16)
+        img_array = self.__reduce_resolution(img_array)
+            
+        doubled, filter_mask, tmp_mask = self.__get_buffers(img_array.shape[:2])
+        np.multiply(img_array, 2, out=doubled, dtype=np.int16)
         
         # Lediglich die Farbwerte behalten, die doppelt so groß sind, wie die der beiden anderen Farben
         # Ist sehr gut in der Lage, die Bälle zu erkennen.
-        filtered_red = (img_array[:,:,1]*2 < img_array[:,:,0]) & (img_array[:,:,2]*2 < img_array[:,:,0])
-        filtered_green = (img_array[:,:,0]*2 < img_array[:,:,1]) & (img_array[:,:,2]*2 < img_array[:,:,1])
-        filtered_blue = (img_array[:,:,0]*2 < img_array[:,:,2]) & (img_array[:,:,1]*2 < img_array[:,:,2])
-    
-    
-        img_array[:,:,0][~filtered_red] = 0
-        img_array[:,:,1][~filtered_green] = 0
-        img_array[:,:,2][~filtered_blue] = 0
+        for channel, (other_1, other_2) in enumerate([(1, 2), (0, 2), (0, 1)]):
+            np.less(doubled[:,:,other_1], img_array[:,:,channel], out=filter_mask[:,:,channel])
+            np.less(doubled[:,:,other_2], img_array[:,:,channel], out=tmp_mask)
+            np.logical_and(filter_mask[:,:,channel], tmp_mask, out=filter_mask[:,:,channel])
         
-        return img_array
+        return filter_mask
 
 
+    def __smooth_mean(self, velocity_left, velocity_right):
+        """
+        Speichert die "unsauberen" Velocity-Werte im Ringpuffer und liefert
+        den Mittelwert der letzten smoothing_window Werte. Die Summe wird
+        laufend aktualisiert und bei jedem Umlauf des Puffers neu berechnet,
+        damit sich keine Rundungsfehler aufsummieren.
+        """
+        position = self.velocity_position
+        self.velocity_left_sum += velocity_left - self.velocity_left_long_term[position]
+        self.velocity_right_sum += velocity_right - self.velocity_right_long_term[position]
+        self.velocity_left_long_term[position] = velocity_left
+        self.velocity_right_long_term[position] = velocity_right
+        
+        self.velocity_position = (position + 1) % self.smoothing_window
+        self.velocity_count = min(self.velocity_count + 1, self.smoothing_window)
+        
+        if self.velocity_position == 0:
+            self.velocity_left_sum = sum(self.velocity_left_long_term)
+            self.velocity_right_sum = sum(self.velocity_right_long_term)
+        
+        return self.velocity_left_sum/self.velocity_count, self.velocity_right_sum/self.velocity_count
+    
+    def __smooth_ema(self, velocity_left, velocity_right):
+        """
+        Exponentielle Glättung der "unsauberen" Velocity-Werte.
+        """
+        if self.velocity_left_ema is None:
+            self.velocity_left_ema, self.velocity_right_ema = velocity_left, velocity_right
+        else:
+            self.velocity_left_ema += self.ema_alpha*(velocity_left - self.velocity_left_ema)
+            self.velocity_right_ema += self.ema_alpha*(velocity_right - self.velocity_right_ema)
+            
+        return self.velocity_left_ema, self.velocity_right_ema
+        
     def __action_to_velocity(self, action):
         """
         Unter Berücksichtung der Sektorgewichtungen und des 
@@ -215,12 +580,8 @@ class CollectorLogik:
 
         """
         # Steuersignale definiere anhand der gegebenen Actionen
-        velocity_right = np.sum(action*np.array(self.sector_weights))/self.sensitivity_factor
-        velocity_left = np.sum(action*np.array(self.sector_weights[::-1]))/self.sensitivity_factor
-         
-        # Die "unsauberen" berechneten Steuersignale werden entsprechend gespeichert
-        self.velocity_left_long_term.append(velocity_left)
-        self.velocity_right_long_term.append(velocity_right)
+        velocity_right = float(np.sum(action*self.sector_weights_right))/self.sensitivity_factor
+        velocity_left = float(np.sum(action*self.sector_weights_left))/self.sensitivity_factor
      
         # Ableiten des velocity aus dem Mittel der "unsauberen" velocity-Werte
         # der letzen 5 Iterationen. Kann als Kurzzeitgedächtnis verstanden
@@ -228,14 +589,16 @@ class CollectorLogik:
         # Wert ist als 5 gewählt worden, da so zeitnah aber nicht instabil
         # reagiert wird. Ein höherer Wert, (bspw. 50) führt dazu, dass der
         # Roboter Schlangenlinien fährt.
-        v_left = np.mean(self.velocity_left_long_term[-5:])
-        v_right= np.mean(self.velocity_right_long_term[-5:])
+        if self.smoothing == "ema":
+            v_left, v_right = self.__smooth_ema(velocity_left, velocity_right)
+        else:
+            v_left, v_right = self.__smooth_mean(velocity_left, velocity_right)
         
         # Bestimmen, wie sinvoll es ist, zu fahren oder
         # weiter nach neuem Ball zu suchen
         if abs(v_left) <= self.min_velocity\
           and abs(v_right) <= self.min_velocity\
-           or all(np.array(action) <= self.min_action):
+           or (action <= self.min_action).all():
             v_left = 6.28
             v_right = -6.28
             
@@ -253,7 +616,7 @@ class CollectorLogik:
         
         return v_left, v_right
         
-    def choose(self, image):
+    def choose(self, image, width=None, height=None, profiler=None):
         """
         Beschreibt die Zusammenarbeit aller der
         obigen Funktionen.
@@ -262,7 +625,15 @@ class CollectorLogik:
         ----------
         image :
             Ausgabe der Funktion camera.getImageArray()
-            des Roboters.
+            des Roboters oder der rohe BGRA-Puffer von
+            camera.getImage(). Letzterer wird ohne Kopie
+            verarbeitet und benötigt width und height.
+        width : int, optional
+            Breite des Bildes (camera.getWidth()).
+        height : int, optional
+            Höhe des Bildes (camera.getHeight()).
+        profiler : instrumentation.LoopProfiler, optional
+            Misst die Dauer der einzelnen Abschnitte. The default is None.
 
         Returns
         -------
@@ -272,8 +643,260 @@ class CollectorLogik:
            Velocity des rechten Rads.
 
         """
-        img_filter = self.__ball_filter(image)
+        img_filter = self.__ball_filter(image, width, height)
+        if profiler is not None:
+            profiler.mark("ball_filter")
         action = self.__choose_action(img_filter)
+        if profiler is not None:
+            profiler.mark("choose_action")
+        velocity = self.__action_to_velocity(action)
+        if profiler is not None:
+            profiler.mark("action_to_velocity")
+        
+        return velocity
+ 
+
+class BatchCollectorLogik:
+    
+    def __init__(self, n_robots, rewards=[1,-1.5,2.5],
+                sector_weights= [2,1,4,-1,-1],
+                sensitivity_factor = 3,
+                min_velocity = 2, min_action = 2,
+                smoothing_window = 5):
+        """
+        Verarbeitet die Bilder mehrerer Roboter (bspw. eines Schwarms oder
+        verschiedener Parametersätze) gleichzeitig. Filter, Scores und die
+        Regeln zur Bestimmung der Velocity sind entlang der Roboter vektorisiert,
+        wobei jeder Roboter sein eigenes Kurzzeitgedächtnis der Velocity-Werte besitzt.
+        Das Ergebnis entspricht für jeden Roboter dem der CollectorLogik
+        mit smoothing = "mean" bei voller Auflösung.
+
+        Parameters
+        ----------
+        n_robots : int
+            Anzahl der Roboter.
+        rewards : list, optional
+            Siehe CollectorLogik. Entweder ein Parametersatz für alle Roboter
+            oder einer pro Roboter (n_robots x 3).
+            The default is [1,-1.5,2.5].
+        sector_weights : list, optional
+            Siehe CollectorLogik. Entweder ein Parametersatz für alle Roboter
+            oder einer pro Roboter (n_robots x 5).
+            The default is [2,1,4,-1,-1].
+        sensitivity_factor : int, optional
+            Siehe CollectorLogik. Entweder ein Wert für alle Roboter
+            oder einer pro Roboter. The default is 3.
+        min_velocity : TYPE, optional
+            Siehe CollectorLogik. Entweder ein Wert für alle Roboter
+            oder einer pro Roboter. The default is 2.
+        min_action : TYPE, optional
+            Siehe CollectorLogik. Entweder ein Wert für alle Roboter
+            oder einer pro Roboter. The default is 2.
+        smoothing_window : int, optional
+            Siehe CollectorLogik, gilt für alle Roboter. The default is 5.
+
+        Returns
+        -------
+        None.
+
+        """
+        if smoothing_window < 1:
+            raise ValueError(f"smoothing_window muss mindestens 1 sein, nicht {smoothing_window}")
+        
+        self.n_robots = n_robots
+        self.rewards = np.broadcast_to(np.asarray(rewards, dtype=float), (n_robots, 3)).copy()
+        self.sector_weights = np.broadcast_to(np.asarray(sector_weights, dtype=float), (n_robots, 5)).copy()
+        self.sensitivity_factor = np.broadcast_to(np.asarray(sensitivity_factor, dtype=float), (n_robots,)).copy()
+        self.min_velocity = np.broadcast_to(np.asarray(min_velocity, dtype=float), (n_robots,)).copy()
+        self.min_action = np.broadcast_to(np.asarray(min_action, dtype=float), (n_robots,)).copy()
+        self.smoothing_window = smoothing_window
+        
+        # Ringpuffer der "unsauberen" Velocity-Werte (links, rechts) pro Roboter
+        self.velocity_long_term = np.zeros((smoothing_window, n_robots, 2))
+        self.velocity_sum = np.zeros((n_robots, 2))
+        self.velocity_count = np.zeros(n_robots, dtype=int)
+        self.velocity_position = 0
+        
+    def reset(self, robots=None):
+        """
+        Setzt das Kurzzeitgedächtnis der gegebenen Roboter zurück.
+
+        Parameters
+        ----------
+        robots : array-like, optional
+            Indizes der Roboter. The default is None, also alle Roboter.
+
+        Returns
+        -------
+        None.
+
+        """
+        robots = slice(None) if robots is None else robots
+        self.velocity_long_term[:, robots] = 0
+        self.velocity_sum[robots] = 0
+        self.velocity_count[robots] = 0
+        
+    def __ball_filter(self, frames, width=None, height=None):
+        """
+        Filterlogik der CollectorLogik für alle Bilder gleichzeitig.
+
+        Parameters
+        ----------
+        frames : np.array or list
+            Bilder im Format des Puffers von camera.getImage() mit width und
+            height, also ein Array (n_robots x Höhe x Breite x BGRA) oder eine
+            Liste der Puffer (bytes) aller Roboter, oder im Format von
+            camera.getImageArray() (n_robots x Breite x Höhe x RGB).
+
+        Returns
+        -------
+        filter_mask : np.array
+            Maske (n_robots x Breite x Höhe x RGB).
+
+        """
+        if width is not None and height is not None:
+            if isinstance(frames, np.ndarray):
+                bgra = frames.astype(np.uint8, copy=False)
+            else:
+                # Liste der Puffer von camera.getImage()
+                bgra = np.frombuffer(b"".join(frames), dtype=np.uint8)
+            bgra = bgra.reshape(self.n_robots, height, width, 4)
+            img_array = bgra.transpose(0, 2, 1, 3)[...,2::-1]
+        else:
+            img_array = np.asarray(frames, dtype=np.int16)
+            
+        doubled = np.multiply(img_array, 2, dtype=np.int16)
+        filter_mask = np.empty(img_array.shape, dtype=bool)
+        for channel, (other_1, other_2) in enumerate([(1, 2), (0, 2), (0, 1)]):
+            np.logical_and(doubled[...,other_1] < img_array[...,channel],
+                           doubled[...,other_2] < img_array[...,channel], out=filter_mask[...,channel])
+            
+        return filter_mask
+    
+    def __choose_action(self, filter_mask, rewards):
+        """
+        Scores pro Sektor, Farbe und Roboter in einer Reduktion und deren
+        Aggregation mit den Rewards des jeweiligen Roboters.
+
+        Returns
+        -------
+        np.array
+            Reward pro Sektor (n_robots x 5).
+
+        """
+        filtered_pixels = filter_mask.reshape(self.n_robots, -1, 3)
+        pixel_counts = np.add.reduceat(filtered_pixels, sector_indices(filter_mask.shape[1:3]), axis=1, dtype=np.int64)
+        
+        return self.__counts_to_action(pixel_counts[:,::2], rewards)
+    
+    def __counts_to_action(self, pixel_counts, rewards):
+        """
+        Aggregation der Scores (Wurzel der Pixel pro Sektor und Farbe) mit den Rewards.
+        """
+        score = pixel_counts**.5
+        
+        return score[:,:,0]*rewards[:,0:1] + score[:,:,1]*rewards[:,1:2] + score[:,:,2]*rewards[:,2:3]
+    
+    def __action_to_velocity(self, action, sector_weights):
+        """
+        Regeln der CollectorLogik.__action_to_velocity, vektorisiert über die Roboter.
+
+        Returns
+        -------
+        np.array
+            Velocity-Werte (n_robots x 2) mit den Spalten links und rechts.
+
+        """
+        velocity = np.empty((self.n_robots, 2))
+        velocity[:,0] = np.sum(action*sector_weights[:,::-1], axis=1)/self.sensitivity_factor
+        velocity[:,1] = np.sum(action*sector_weights, axis=1)/self.sensitivity_factor
+        
+        # Mittelwert der letzten smoothing_window Werte pro Roboter
+        position = self.velocity_position
+        self.velocity_sum += velocity - self.velocity_long_term[position]
+        self.velocity_long_term[position] = velocity
+        self.velocity_position = (position + 1) % self.smoothing_window
+        np.minimum(self.velocity_count + 1, self.smoothing_window, out=self.velocity_count)
+        if self.velocity_position == 0:
+            self.velocity_sum = self.velocity_long_term.sum(axis=0)
+        
+        smoothed = self.velocity_sum/self.velocity_count[:,None]
+        v_left, v_right = smoothed[:,0], smoothed[:,1]
+        
+        # Drehen um nach neuen Bällen zu suchen
+        is_searching = (np.abs(v_left) <= self.min_velocity) & (np.abs(v_right) <= self.min_velocity)\
+                       | (action <= self.min_action[:,None]).all(axis=1)
+        # Geradeaus fahren
+        is_straight = ~is_searching & (np.abs(v_left - v_right) < 1)
+        # Skalieren der Werte auf das Intervall [-6.28, 6.28]
+        max_value = np.maximum(np.abs(v_left), np.abs(v_right))
+        is_scaled = ~is_searching & ~is_straight & (max_value > 6.28)
+        multiplicator = np.divide(6.28, max_value, out=np.ones_like(max_value), where=is_scaled)
+        
+        smoothed[is_scaled] *= (multiplicator[is_scaled] - 0.0001)[:,None]
+        smoothed[is_searching] = [6.28, -6.28]
+        smoothed[is_straight] = [6.28, 6.28]
+        
+        return smoothed
+    
+    def choose(self, frames, width=None, height=None, rewards=None, sector_weights=None):
+        """
+        Bestimmt die Velocity-Werte aller Roboter aus ihren Bildern.
+
+        Parameters
+        ----------
+        frames : np.array
+            Bilder aller Roboter, siehe __ball_filter.
+        width : int, optional
+            Breite der Bilder, nur für das Format von camera.getImage().
+        height : int, optional
+            Höhe der Bilder, nur für das Format von camera.getImage().
+        rewards : np.array, optional
+            Rewards pro Roboter (n_robots x 3) für diesen Aufruf.
+            The default is None, also die Rewards aus __init__.
+        sector_weights : np.array, optional
+            Sektorgewichtungen pro Roboter (n_robots x 5) für diesen Aufruf.
+            The default is None, also die Gewichtungen aus __init__.
+
+        Returns
+        -------
+        np.array
+            Velocity-Werte (n_robots x 2) mit den Spalten links und rechts.
+
+        """
+        rewards = self.rewards if rewards is None else np.asarray(rewards, dtype=float)
+        sector_weights = self.sector_weights if sector_weights is None else np.asarray(sector_weights, dtype=float)
+        
+        filter_mask = self.__ball_filter(frames, width, height)
+        action = self.__choose_action(filter_mask, rewards)
+        
+        return self.__action_to_velocity(action, sector_weights)
+    
+    def choose_counts(self, pixel_counts, rewards=None, sector_weights=None):
+        """
+        Bestimmt die Velocity-Werte aller Roboter aus den bereits gezählten
+        Pixeln der Bälle pro Sektor und Farbe, bspw. von einem Simulator, der
+        die Bälle direkt rastert, anstatt Bilder zu rendern und zu filtern.
+        Die Zählung muss der von __ball_filter und sector_indices entsprechen.
+
+        Parameters
+        ----------
+        pixel_counts : np.array
+            Anzahl der Pixel pro Roboter, Sektor und Farbe (n_robots x 5 x RGB).
+        rewards : np.array, optional
+            Siehe choose.
+        sector_weights : np.array, optional
+            Siehe choose.
+
+        Returns
+        -------
+        np.array
+            Velocity-Werte (n_robots x 2) mit den Spalten links und rechts.
+
+        """
+        rewards = self.rewards if rewards is None else np.asarray(rewards, dtype=float)
+        sector_weights = self.sector_weights if sector_weights is None else np.asarray(sector_weights, dtype=float)
+        
+        action = self.__counts_to_action(np.asarray(pixel_counts, dtype=np.int64), rewards)
         
-        return self.__action_to_velocity(action)
- 
\ No newline at end of file
+        return self.__action_to_velocity(action, sector_weights)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 10:17:52 2026
+
+Ersatz für die Geräte von Webots, damit die Logik des Controllers
+ohne Simulation getestet und gebenchmarkt werden kann.
+"""
+import collections
+import numpy as np
+
+
+def rgb_to_bgra(frame):
+    """
+    Wandelt ein Bild im Format von camera.getImageArray() (Breite x Höhe x RGB)
+    in das Format des Puffers von camera.getImage() (Höhe x Breite x BGRA) um.
+
+    Parameters
+    ----------
+    frame : np.array
+        Bild mit den Dimensionen (width, height, 3).
+
+    Returns
+    -------
+    np.array
+        Bild mit den Dimensionen (height, width, 4) und dtype uint8.
+
+    """
+    frame = np.asarray(frame)
+    bgra = np.full((frame.shape[1], frame.shape[0], 4), 255, dtype=np.uint8)
+    bgra[:,:,:3] = frame.transpose(1, 0, 2)[:,:,::-1]
+    return bgra
+
+
+class StubCamera:
+
+    def __init__(self, frames):
+        """
+        Verhält sich wie die Kamera des e-pucks und liefert
+        nacheinander die gegebenen Bilder.
+
+        Parameters
+        ----------
+        frames : list
+            Bilder im Format von camera.getImageArray()
+            (Breite x Höhe x RGB).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.frames = [rgb_to_bgra(frame) for frame in frames]
+        self.index = 0
+
+    def enable(self, timestep):
+        pass
+
+    def getWidth(self):
+        return self.frames[self.index].shape[1]
+
+    def getHeight(self):
+        return self.frames[self.index].shape[0]
+
+    def getImage(self):
+        return self.frames[self.index].tobytes()
+
+    def getImageArray(self):
+        return self.frames[self.index][:,:,2::-1].transpose(1, 0, 2).tolist()
+
+    def step(self):
+        """
+        Wechselt zum nächsten Bild, wie es ein Simulationsschritt tun würde.
+        Gibt False zurück, wenn keine weiteren Bilder vorhanden sind.
+        """
+        if self.index + 1 >= len(self.frames):
+            return False
+        self.index += 1
+        return True
+
+
+class StubReceiver:
+
+    def __init__(self, packets=()):
+        """
+        Verhält sich wie der Receiver des e-pucks und liefert
+        die gegebenen Pakete in der Reihenfolge ihres Eintreffens.
+
+        Parameters
+        ----------
+        packets : list, optional
+            Bereits empfangene Pakete als bytes.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.packets = collections.deque(packets)
+
+    def enable(self, timestep):
+        pass
+
+    def send(self, packet):
+        """
+        Fügt ein Paket hinzu, als wäre es empfangen worden.
+        """
+        self.packets.append(packet)
+
+    def getQueueLength(self):
+        return len(self.packets)
+
+    def getData(self):
+        return self.packets[0]
+
+    def nextPacket(self):
+        self.packets.popleft()
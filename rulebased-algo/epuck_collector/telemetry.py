@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 11:02:47 2026
+
+Verarbeitung der Nachrichten des Receivers außerhalb der Steuerschleife.
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+import msgpack
+
+
+class TelemetryPipeline:
+
+    def __init__(self, path="telemetry.jsonl", max_queue=1000, max_batch=64,
+                 max_bytes=1_000_000, backup_count=3, flush_interval=1.0):
+        """
+        Liest die Pakete des Receivers blockweise, dekodiert sie mit einem
+        streamenden msgpack.Unpacker und übergibt die Nachrichten an eine
+        begrenzte Queue. Jedes Paket muss vollständige Nachrichten enthalten,
+        ein abgeschnittenes oder fehlerhaftes Paket zählt als Dekodierfehler.
+        Ein eigener Thread schreibt die Nachrichten als JSON-Zeilen in eine
+        rotierende Datei. Ist die Queue voll, werden neue Nachrichten
+        verworfen, anstatt die Steuerschleife zu blockieren.
+
+        Parameters
+        ----------
+        path : str, optional
+            Datei der Nachrichten. The default is "telemetry.jsonl".
+        max_queue : int, optional
+            Maximale Anzahl der Nachrichten in der Queue. The default is 1000.
+        max_batch : int, optional
+            Maximale Anzahl der Pakete, die pro Aufruf von drain gelesen werden.
+            Weitere Pakete verbleiben im Receiver bis zum nächsten Schritt.
+            The default is 64.
+        max_bytes : int, optional
+            Größe, ab der die Datei rotiert wird. The default is 1_000_000.
+        backup_count : int, optional
+            Anzahl der rotierten Dateien, die behalten werden. The default is 3.
+        flush_interval : float, optional
+            Maximale Zeit in Sekunden, die der Thread auf neue Nachrichten
+            wartet, bevor die Datei geschrieben wird. The default is 1.0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.unpacker = msgpack.Unpacker()
+        self.bytes_fed = 0
+
+        # eigener Logger, damit die Nachrichten nicht im Log des Controllers landen
+        self.handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                            backupCount=backup_count, delay=True)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger = logging.getLogger(f"telemetry.{path}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+        self.thread = None
+        self.is_running = False
+
+        self.packets_received = 0
+        self.messages_decoded = 0
+        self.messages_dropped = 0
+        self.messages_written = 0
+        self.decode_errors = 0
+        self.receiver_backlog = 0
+        self.max_queue_size = 0
+
+    def start(self):
+        """
+        Startet den Thread, der die Nachrichten schreibt.
+        """
+        self.is_running = True
+        self.thread = threading.Thread(target=self.__write, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Beendet den Thread, nachdem alle Nachrichten der Queue geschrieben wurden.
+        """
+        self.is_running = False
+        self.thread.join()
+        self.handler.close()
+        self.logger.removeHandler(self.handler)
+
+    def drain(self, receiver, step):
+        """
+        Liest bis zu max_batch Pakete des Receivers und übergibt die
+        dekodierten Nachrichten an die Queue, ohne zu blockieren.
+
+        Parameters
+        ----------
+        receiver : Receiver
+            Receiver des Roboters oder stubs.StubReceiver.
+        step : int
+            Nummer des Simulationsschritts.
+
+        Returns
+        -------
+        packets : list
+            Rohe Pakete dieses Schritts, bspw. für den FrameRecorder.
+
+        """
+        packets = []
+        while len(packets) < self.max_batch and receiver.getQueueLength() > 0:
+            packets.append(receiver.getData())
+            receiver.nextPacket()
+        self.receiver_backlog = receiver.getQueueLength()
+        self.packets_received += len(packets)
+
+        timestamp = time.time()
+        for packet in packets:
+            bytes_decoded = self.bytes_fed
+            self.unpacker.feed(packet)
+            self.bytes_fed += len(packet)
+            try:
+                for message in self.unpacker:
+                    self.messages_decoded += 1
+                    try:
+                        self.queue.put_nowait((timestamp, step, message))
+                    except queue.Full:
+                        self.messages_dropped += 1
+                    bytes_decoded = self.unpacker.tell()
+                # jedes Paket enthält nur vollständige Nachrichten, Reste stammen von einem
+                # abgeschnittenen Paket (tell zählt auch angefangene Nachrichten, daher nach jeder Nachricht)
+                is_consumed = bytes_decoded == self.bytes_fed
+            except (msgpack.UnpackException, ValueError):
+                is_consumed = False
+
+            if not is_consumed:
+                # fehlerhaftes Paket verwerfen und mit einem leeren Puffer fortfahren,
+                # damit der Rest nicht das nächste Paket verfälscht
+                self.decode_errors += 1
+                self.unpacker = msgpack.Unpacker()
+                self.bytes_fed = 0
+
+        self.max_queue_size = max(self.max_queue_size, self.queue.qsize())
+        return packets
+
+    def stats(self):
+        """
+        Zähler der Pipeline, bspw. für das Logging.
+
+        Returns
+        -------
+        dict
+            Anzahl empfangener Pakete, dekodierter, verworfener und
+            geschriebener Nachrichten, Dekodierfehler, im Receiver verbliebene
+            Pakete sowie die aktuelle und maximale Länge der Queue.
+
+        """
+        return dict(packets_received=self.packets_received,
+                    messages_decoded=self.messages_decoded,
+                    messages_dropped=self.messages_dropped,
+                    messages_written=self.messages_written,
+                    decode_errors=self.decode_errors,
+                    receiver_backlog=self.receiver_backlog,
+                    queue_size=self.queue.qsize(),
+                    max_queue_size=self.max_queue_size)
+
+    def __write(self):
+        """
+        Schleife des Threads: Schreibt alle Nachrichten der Queue blockweise.
+        """
+        while self.is_running or not self.queue.empty():
+            try:
+                records = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for timestamp, step, message in records:
+                self.logger.info(json.dumps(dict(time=timestamp, step=step, message=message), default=repr))
+            self.handler.flush()
+            self.messages_written += len(records)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 09:48:26 2026
+"""
+import threading
+
+
+class VisionPipeline:
+
+    def __init__(self, collector, width, height, initial_velocity=(0.0, 0.0)):
+        """
+        Entkoppelt die Bildverarbeitung von der Steuerschleife des Controllers.
+        Die Bilder werden in einem eigenen Thread durch CollectorLogik.choose
+        verarbeitet, wobei immer nur das neueste Bild berücksichtigt wird.
+        Bilder, die noch nicht verarbeitet wurden, wenn ein neues eintrifft,
+        werden verworfen. Die Steuerschleife nutzt ohne zu warten die
+        zuletzt getroffene Entscheidung.
+
+        Parameters
+        ----------
+        collector : CollectorLogik
+            Logik, die aus den Bildern die Velocity-Werte bestimmt.
+        width : int
+            Breite der Bilder (camera.getWidth()).
+        height : int
+            Höhe der Bilder (camera.getHeight()).
+        initial_velocity : tuple, optional
+            Velocity-Werte bis zur ersten Entscheidung.
+            The default is (0.0, 0.0).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.collector = collector
+        self.width = width
+        self.height = height
+
+        self.condition = threading.Condition()
+        self.thread = None
+        self.is_running = False
+
+        # neuestes, noch nicht verarbeitetes Bild mit dem Schritt der Aufnahme
+        self.pending_frame = None
+        self.pending_step = None
+
+        # letzte Entscheidung mit dem Schritt, in dem das zugehörige Bild aufgenommen wurde
+        self.velocity = initial_velocity
+        self.decision_step = None
+        self.decision_age = None
+
+        # Schritt des Bildes der zuletzt von latest zurückgegebenen Entscheidung
+        self.latest_decision_step = None
+
+        self.frames_submitted = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.max_decision_age = 0
+
+    def start(self):
+        """
+        Startet den Thread der Bildverarbeitung.
+        """
+        self.is_running = True
+        self.thread = threading.Thread(target=self.__process, name="vision-pipeline", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Beendet den Thread der Bildverarbeitung, nachdem das aktuelle Bild verarbeitet wurde.
+        """
+        with self.condition:
+            self.is_running = False
+            self.condition.notify()
+        self.thread.join()
+
+    def submit(self, image, step):
+        """
+        Übergibt ein neues Bild an die Verarbeitung, ohne zu blockieren.
+        Ein noch nicht verarbeitetes älteres Bild wird verworfen.
+
+        Parameters
+        ----------
+        image : bytes
+            Ausgabe der Funktion camera.getImage(). Das Objekt darf nach der
+            Übergabe nicht mehr verändert werden.
+        step : int
+            Nummer des Simulationsschritts, in dem das Bild aufgenommen wurde.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.condition:
+            if self.pending_frame is not None:
+                self.frames_dropped += 1
+            self.pending_frame = image
+            self.pending_step = step
+            self.frames_submitted += 1
+            self.condition.notify()
+
+    def latest(self, step):
+        """
+        Liefert die zuletzt getroffene Entscheidung, ohne zu blockieren.
+
+        Parameters
+        ----------
+        step : int
+            Nummer des aktuellen Simulationsschritts, um das Alter der
+            Entscheidung zu bestimmen.
+
+        Returns
+        -------
+        v_left : float
+            Velocity des linken Rads.
+        v_right : float
+           Velocity des rechten Rads.
+
+        """
+        with self.condition:
+            velocity, decision_step = self.velocity, self.decision_step
+        self.latest_decision_step = decision_step
+
+        if decision_step is not None:
+            self.decision_age = step - decision_step
+            self.max_decision_age = max(self.max_decision_age, self.decision_age)
+
+        return velocity
+
+    def stats(self):
+        """
+        Zähler der Pipeline, bspw. für das Logging.
+
+        Returns
+        -------
+        dict
+            Anzahl übergebener, verarbeiteter und verworfener Bilder
+            sowie das aktuelle und maximale Alter der Entscheidung in Schritten.
+
+        """
+        return dict(frames_submitted=self.frames_submitted,
+                    frames_processed=self.frames_processed,
+                    frames_dropped=self.frames_dropped,
+                    decision_age=self.decision_age,
+                    max_decision_age=self.max_decision_age)
+
+    def __process(self):
+        """
+        Schleife des Threads: Wartet auf ein neues Bild und verarbeitet es.
+        """
+        while True:
+            with self.condition:
+                while self.pending_frame is None and self.is_running:
+                    self.condition.wait()
+                if not self.is_running:
+                    return
+
+                image, step = self.pending_frame, self.pending_step
+                self.pending_frame = None
+
+            velocity = self.collector.choose(image, self.width, self.height)
+
+            with self.condition:
+                self.velocity = velocity
+                self.decision_step = step
+                self.frames_processed += 1